@@ -1,6 +1,5 @@
 import fnmatch
 import glob
-import importlib.util
 import sys
 import textwrap
 from pathlib import Path
@@ -10,45 +9,15 @@ from blark.parse import ParseResult, summarize
 from click import Context
 
 from . import lint
-from .parse import parse_all_source_items
+from .parse import parse_all_source_items, shutdown_pool
 from .settings import load_settings
 from .utils import log
+from .utils.plugin import load_plugins
 
 logger = log.get_logger()
 DEFAULT_CACHE_DIR = Path(".catscan")
 
 
-def _load_plugins(plugins: tuple[Path]):
-    """Load catscan plugins from paths. This is done by simply importing the module. The
-    @lint_check decorator should then automatically register new plugins."""
-
-    def import_module_from_path(path: Path):
-        logger.info(f"Loading plugin from {path}")
-        spec = importlib.util.spec_from_file_location(path.stem, str(path))
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-
-    def recursively_import(path: Path):
-        """Recursively import modules from a directory or file."""
-
-        if path.is_file() and path.suffix == ".py":
-            # Simple single-file python module
-            import_module_from_path(path)
-        elif path.is_dir():
-            init_file = path / "__init__.py"
-            if init_file.exists():
-                # directory-based python module
-                import_module_from_path(init_file)
-            else:
-                # load modules recursively
-                for sub_path in path.iterdir():
-                    recursively_import(sub_path)
-
-    for plugin in plugins:
-        recursively_import(plugin)
-
-
 @click.group()
 @click.option(
     "-s",
@@ -69,7 +38,7 @@ def main(
     settings: Path | None,
     plugins: tuple[Path],
 ):
-    _load_plugins(plugins)
+    load_plugins(plugins)
     ctx.obj = load_settings(settings)
 
 
@@ -95,6 +64,11 @@ def list_(_ctx: Context):
 @click.option(
     "--use-cache/--no-cache", default=True, help="Enable or disable caching (default: enabled)"
 )
+@click.option(
+    "--parallel/--no-parallel",
+    default=False,
+    help="Lint function blocks in parallel processes (default: disabled)",
+)
 @click.option(
     "--cache-dir",
     type=click.Path(file_okay=False, path_type=Path),
@@ -130,6 +104,7 @@ def list_(_ctx: Context):
 def lint_(
     ctx: Context,
     use_cache: bool,
+    parallel: bool,
     cache_dir: Path,
     root_dir: Path,
     excludes: tuple[str],
@@ -152,12 +127,14 @@ def lint_(
     )
     results: list[ParseResult] = []
     results.extend(parse_all_source_items(files, cache_dir=cache_dir, use_cache=use_cache))
+    # the lint process pool forks this process, which should not have any threads left
+    shutdown_pool()
 
     logger.info("Summarizing...")
     summary = summarize(results, squash=False)
 
     logger.info("Linting...")
-    exit_code = lint.lint(summary, ctx.obj)
+    exit_code = lint.lint(summary, ctx.obj, parallel=parallel)
     sys.exit(exit_code)
 
 
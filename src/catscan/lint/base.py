@@ -1,22 +1,33 @@
+import concurrent.futures as fut
 import inspect
+import io
 import re
+import sys
 from collections import defaultdict
-from collections.abc import Callable, Iterator
-from typing import Annotated, TypedDict, Unpack
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import TypedDict, Unpack
 
 import blark.transform as tf
 from blark.summary import (
     CodeSummary,
+    FunctionBlockSummary,
+    MethodSummary,
+    PropertyGetSetSummary,
+    PropertySummary,
     Summary,
 )
-from pydantic import BaseModel, StringConstraints
 
 from catscan.settings import CheckLevel, Settings
 from catscan.utils import log
+from catscan.utils.plugin import load_plugins, loaded_plugins
 from catscan.utils.program import (
-    get_expressions,
-    get_statements,
-    get_subexpressions,
+    cached_statements,
+    clear_traversal_cache,
+    get_statement_subexpressions,
 )
 
 from .context import Context
@@ -29,9 +40,15 @@ LintCheckFunction = Callable[[CheckableObject, ...], Iterator[ErrorInfo]]
 __REGISTERED_CODES__: set[str] = set()
 __REGISTERED_CHECKS__: dict[type[CheckableObject], list["LintCheck"]] = defaultdict(list)
 
+# registered checks for each concrete checkable type, so dispatching a checkable object does not
+# require an isinstance check against every registered type
+_DISPATCH_CACHE: dict[type, tuple["LintCheck", ...]] = {}
+
 CODE_PATT = r"[A-Z]{2,4}\d{3,4}"
-LintCode = Annotated[str, StringConstraints(pattern=CODE_PATT)]
-NOQA_RE = re.compile(fr"//\s*noqa:\s*({CODE_PATT}(\s+{CODE_PATT})*)$")
+NOQA_RE = re.compile(
+    fr"//[ \t]*noqa:[ \t]*({CODE_PATT}(?:[ \t]+{CODE_PATT})*)\s*$",
+    re.ASCII,
+)
 
 
 class ExtraCheckParams(TypedDict):
@@ -39,62 +56,83 @@ class ExtraCheckParams(TypedDict):
     settings: Settings
 
 
-def _is_noqa(error_line: str, code: str) -> bool:
-    noqa = NOQA_RE.search(error_line)
+@lru_cache(maxsize=1024)
+def _get_noqa_codes(error_line: str) -> frozenset[str]:
+    """Get the codes listed in the noqa comment of a line (the same line is often checked for
+    multiple errors, hence the cache)"""
+    # the noqa comment must run up to the end of the line, so a match can only start at the
+    # last comment marker; the regex is anchored there instead of searching the whole line
+    start = error_line.rfind("//")
+    if start < 0 or error_line.find("noqa", start) < 0:
+        return frozenset()
+    noqa = NOQA_RE.match(error_line, start)
     if noqa is None:
-        return False
-    return code in noqa.string
+        return frozenset()
+    # codes are interned, like the registered check codes, so membership tests hit on identity
+    return frozenset(map(sys.intern, noqa.group(1).split()))
+
+
+def _is_noqa(error_line: str, code: str) -> bool:
+    return code in _get_noqa_codes(error_line)
 
 
-class LintCheck(BaseModel):
-    """Wrapped lint check with additional meta info"""
+@dataclass(slots=True)
+class LintCheck:
+    """Wrapped lint check with additional meta info. The code is validated by lint_check."""
 
     func: LintCheckFunction
-    code: LintCode
+    code: str
 
-    @property
-    def name(self) -> str:
-        return self.func.__name__
+    name: str = field(init=False)
+    doc: str = field(init=False)
 
-    @property
-    def doc(self) -> str:
-        return re.sub(r"[\n\s]+", " ", self.func.__doc__)
+    # parameter names of the wrapped function, as inspecting the signature on every call is slow
+    _params: frozenset[str] = field(init=False)
 
-    def __call__(
-        self,
-        obj: CheckableObject,
-        **kwargs: Unpack[ExtraCheckParams],
-    ) -> Iterator[Error]:
-        """Wrapped call to actual lint check function"""
-        _kwargs = ExtraCheckParams(**kwargs)
-        _settings: Settings = _kwargs["settings"]
-        _err_settings = _settings.checks.get(self.code)
-        _do_yield = _err_settings is None or (
-            _err_settings.enabled and _err_settings.level == CheckLevel.ERROR
-        )
+    def __post_init__(self):
+        self.name = self.func.__name__
+        self.doc = re.sub(r"[\n\s]+", " ", self.func.__doc__ or "")
+        self._params = frozenset(inspect.signature(self.func).parameters)
 
-        # check if this check is skipped
-        check_settings = _settings.checks.get(self.code)
+    def get_level(self, settings: Settings) -> CheckLevel | None:
+        """Get the level this check is run at, or None if the check is skipped"""
+        check_settings = settings.checks.get(self.code)
         check_level = CheckLevel.ERROR
         if check_settings is not None:
             if not check_settings.enabled:
                 # disabled in settings
-                return
+                return None
             check_level = check_settings.level
 
-        if check_level > _settings.level:
+        if check_level > settings.level:
             # disabled by level
-            return
+            return None
+        return check_level
+
+    def __call__(
+        self,
+        obj: CheckableObject,
+        **kwargs: Unpack[ExtraCheckParams],
+    ) -> list[Error]:
+        """Wrapped call to actual lint check function, returns the (non-ignored) errors"""
+        _kwargs = ExtraCheckParams(**kwargs)
+        _settings: Settings = _kwargs["settings"]
+
+        # check if this check is skipped, only errors at the ERROR level are returned
+        check_level = self.get_level(_settings)
+        if check_level is None:
+            return []
+        _do_yield = check_level == CheckLevel.ERROR
 
         # inject context / settings kwargs
-        sig = inspect.signature(self.func)
-        params = set(sig.parameters)
+        params = self._params
         kwargs = {k: v for k, v in _kwargs.items() if k in params}
 
         if missing := set(kwargs) - params:
             msg = f"Missing kwargs for lint check {self.code}: {missing}"
             raise ValueError(msg)
 
+        errors = []
         for info in self.func(obj, **kwargs):
             info.ctx = _kwargs["ctx"]
             err = Error.from_info(self.code, info)
@@ -105,7 +143,8 @@ class LintCheck(BaseModel):
             if error_line is None or not _is_noqa(error_line, self.code):
                 err.pretty_print(f"{check_level.name}:")
                 if _do_yield:
-                    yield err
+                    errors.append(err)
+        return errors
 
 
 def lint_check(code: str) -> Callable[[LintCheckFunction], LintCheck]:
@@ -116,6 +155,7 @@ def lint_check(code: str) -> Callable[[LintCheckFunction], LintCheck]:
         msg = f"'{code}' is not a valid value for a catscan lint check"
         raise ValueError(msg)
 
+    code = sys.intern(code)
     if code in __REGISTERED_CODES__:
         msg = f"Code '{code}' is already used for a linter check"
         raise RuntimeError(msg)
@@ -130,6 +170,7 @@ def lint_check(code: str) -> Callable[[LintCheckFunction], LintCheck]:
             check_type, CheckableObject
         ), "Lint check must act on summaries, statements or expressions"
         __REGISTERED_CHECKS__[check_type].append(wrapped)  # type: ignore
+        _DISPATCH_CACHE.clear()
 
         return wrapped
 
@@ -142,78 +183,167 @@ def list_() -> Iterator[LintCheck]:
         yield from checks
 
 
+def _walk_implementation(
+    obj: MethodSummary | PropertyGetSetSummary | tf.StatementList,
+) -> Iterator[tf.Statement | tf.Expression]:
+    """Iterate through all statements of an implementation, and all (sub)expressions in them"""
+    for stat in cached_statements(obj):
+        yield stat
+        yield from get_statement_subexpressions(stat)
+
+
 def get_checkable_objects(
     code: CodeSummary,
     settings: Settings,
+    function_blocks: Iterable[FunctionBlockSummary] | None = None,
 ) -> Iterator[tuple[CheckableObject, Context]]:
-    """Iterate through all checkable objects and yield the corresponding context"""
+    """Iterate through all checkable objects and yield the corresponding context, optionally
+    only for a subset of the function blocks in the code"""
     ctx = Context(code=code, settings=settings)
 
-    for fb in code.function_blocks.values():
+    if function_blocks is None:
+        function_blocks = code.function_blocks.values()
+    for fb in function_blocks:
         with ctx.function_block(fb):
             yield fb, ctx
 
             for decl in fb.declarations.values():
                 yield decl, ctx
             if fb.implementation is not None:
-                for stat in get_statements(fb.implementation):
-                    yield stat, ctx
-                    for expr in get_expressions(stat):
-                        for subexpr in get_subexpressions(expr):
-                            yield subexpr, ctx
-
-            for method in fb.methods:
-                with ctx.method(method):
-                    yield method, ctx
-                    for decl in method.declarations.values():
-                        yield decl, ctx
-                    for stat in get_statements(method):
-                        yield stat, ctx
-                        for expr in get_expressions(stat):
-                            for subexpr in get_subexpressions(expr):
-                                yield subexpr, ctx
+                for obj in _walk_implementation(fb.implementation):
+                    yield obj, ctx
 
+            # methods and property getters / setters are all checked in their own context,
+            # though properties themselves are checked before entering their getter's context
+            units: list[tuple[PropertySummary | None, MethodSummary | PropertyGetSetSummary]]
+            units = [(None, method) for method in fb.methods]
             for prop in fb.properties:
-                yield prop, ctx
-                with ctx.method(prop.getter):
-                    for decl in prop.getter.declarations.values():
+                units += [(prop, prop.getter), (None, prop.setter)]
+
+            for prop, unit in units:
+                if prop is not None:
+                    yield prop, ctx
+                with ctx.method(unit):
+                    if isinstance(unit, MethodSummary):
+                        yield unit, ctx
+                    for decl in unit.declarations.values():
                         yield decl, ctx
-                    for stat in get_statements(prop.getter):
-                        yield stat, ctx
-                        for expr in get_expressions(stat):
-                            for subexpr in get_subexpressions(expr):
-                                yield subexpr, ctx
-                with ctx.method(prop.setter):
-                    for decl in prop.setter.declarations.values():
-                        yield decl, ctx
-                    for stat in get_statements(prop.setter):
-                        yield stat, ctx
-                        for expr in get_expressions(stat):
-                            for subexpr in get_subexpressions(expr):
-                                yield subexpr, ctx
-
-
-def do_checks(obj: CheckableObject, **kwargs: Unpack[ExtraCheckParams]):
-    for typ, checks in __REGISTERED_CHECKS__.items():
-        if isinstance(obj, typ):
-            for check in checks:
-                yield from check(obj, **kwargs)
+                    for obj in _walk_implementation(unit):
+                        yield obj, ctx
+
+
+def _get_checks(typ: type) -> tuple[LintCheck, ...]:
+    """Get all registered checks for checkable objects of the given (concrete) type"""
+    checks = _DISPATCH_CACHE.get(typ)
+    if checks is None:
+        checks = tuple(
+            check
+            for check_type, type_checks in __REGISTERED_CHECKS__.items()
+            if issubclass(typ, check_type)
+            for check in type_checks
+        )
+        _DISPATCH_CACHE[typ] = checks
+    return checks
+
+
+def do_checks(
+    obj: CheckableObject,
+    checks: Iterable[LintCheck] | None = None,
+    **kwargs: Unpack[ExtraCheckParams],
+) -> list[Error]:
+    """Run checks on a checkable object, by default all registered checks for its type"""
+    if checks is None:
+        checks = _get_checks(type(obj))
+    errors = []
+    for check in checks:
+        if check_errors := check(obj, **kwargs):
+            errors.extend(check_errors)
+    return errors
 
 
-def lint(code: CodeSummary, settings: Settings):
+def _lint_objects(
+    objects: Iterable[tuple[CheckableObject, Context]],
+    settings: Settings,
+) -> list[Error]:
+    """Run all active checks on the checkable objects, and gather the errors"""
     errors = []
 
+    # checks that are skipped based on the settings are filtered out once per type, so they
+    # are never dispatched at all
+    active_checks: dict[type, tuple[LintCheck, ...]] = {}
+
     # some objects may have already been checked, as they qualify both as an expression and
     # as a statement (like FunctionCallStatements)
     already_checked = set()
 
-    for obj, ctx in get_checkable_objects(code, settings):
+    for obj, ctx in objects:
         if id(obj) in already_checked:
             continue
 
-        errors.extend(do_checks(obj, ctx=ctx, settings=settings))
+        typ = type(obj)
+        checks = active_checks.get(typ)
+        if checks is None:
+            checks = tuple(c for c in _get_checks(typ) if c.get_level(settings) is not None)
+            active_checks[typ] = checks
+        if checks and (obj_errors := do_checks(obj, checks, ctx=ctx, settings=settings)):
+            errors.extend(obj_errors)
         already_checked.add(id(obj))
-
+    return errors
+
+
+# code summary and settings of a lint worker process, set once by the pool initializer so they
+# are not sent along with every function block
+_WORKER_STATE: tuple[CodeSummary, Settings] | None = None
+
+
+def _init_lint_worker(code: CodeSummary, settings: Settings, plugins: tuple[Path, ...]):
+    global _WORKER_STATE  # noqa: PLW0603
+    _WORKER_STATE = (code, settings)
+    # spawned workers start from a fresh interpreter, so plugin checks must be registered again
+    # (forked workers inherit them, in which case the plugins are not loaded twice)
+    load_plugins(plugins)
+    clear_traversal_cache()
+
+
+def _lint_function_block(name: str) -> tuple[list[Error], str]:
+    """Lint a single function block in a worker process. Printed errors are captured and
+    returned, so the parent process can print them in a deterministic order."""
+    code, settings = _WORKER_STATE
+    output = io.StringIO()
+    with redirect_stdout(output):
+        objects = get_checkable_objects(code, settings, [code.function_blocks[name]])
+        errors = _lint_objects(objects, settings)
+    return errors, output.getvalue()
+
+
+def find_errors(
+    code: CodeSummary, settings: Settings, parallel: bool = False, **kwargs
+) -> list[Error]:
+    """Get the errors of all function blocks in the code. Function blocks are checked
+    independently, so they can be spread over a ProcessPoolExecutor, kwargs are passed to it
+    (e.g. max_workers). Loaded plugins are loaded in the worker processes as well."""
+    clear_traversal_cache()
+
+    try:
+        if not parallel:
+            return _lint_objects(get_checkable_objects(code, settings), settings)
+
+        errors = []
+        with fut.ProcessPoolExecutor(
+            initializer=_init_lint_worker, initargs=(code, settings, loaded_plugins()), **kwargs
+        ) as pool:
+            for fb_errors, output in pool.map(_lint_function_block, code.function_blocks):
+                print(output, end="")  # noqa: T201
+                errors.extend(fb_errors)
+        return errors
+    finally:
+        # the traversal caches keep the linted code alive
+        clear_traversal_cache()
+
+
+def lint(code: CodeSummary, settings: Settings, parallel: bool = False, **kwargs):
+    """Lint all function blocks in the code, optionally in parallel (see find_errors)"""
+    errors = find_errors(code, settings, parallel=parallel, **kwargs)
     if errors:
         logger.error(f"{len(errors)} errors found")
         return 1
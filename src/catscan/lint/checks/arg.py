@@ -12,12 +12,22 @@ def function_call_named_args(stat: tf.FunctionCallStatement, ctx: Context, setti
     arguments, as to prevent mistakes in (compatible) argument order."""
     if len(stat.parameters) <= settings.max_nameless_args:
         return
-    if str(stat.name) in settings.nameless_arg_functions:
+    unnamed = [
+        param
+        for param in stat.parameters
+        if isinstance(param, tf.InputParameterAssignment) and param.name is None
+    ]
+    if not unnamed:
+        return
+
+    name = stat.name
+    stat_name = str(name)
+    if ctx.get_settings_name(settings.nameless_arg_functions, stat_name) is not None:
         return
 
     meth_info: str | None = None
-    if isinstance(stat.name, tf.MultiElementVariable):
-        *child, meth_name = stat.name.elements
+    if isinstance(name, tf.MultiElementVariable):
+        *child, meth_name = name.elements
         base_typ = None
 
         # the last accessor may be an array selector, which may happen if we have an array of
@@ -26,13 +36,13 @@ def function_call_named_args(stat: tf.FunctionCallStatement, ctx: Context, setti
         # access and call, but in this case it may be excluded globally
         if isinstance(meth_name, tf.FieldSelector):
             meth_name = meth_name.field.name
-            base_typ = ctx.get_multi_element_type(str(stat.name.name), list(child))
+            base_typ = ctx.get_multi_element_type(str(name.name), list(child))
         else:
             # no explicit method name
             meth_name = None
     else:
-        assert isinstance(stat.name, tf.SimpleVariable)
-        meth_name = stat.name.name
+        assert isinstance(name, tf.SimpleVariable)
+        meth_name = name.name
         base_typ = None
         if ctx.current_function_block is not None:
             base_typ = ctx.current_function_block.name
@@ -48,19 +58,23 @@ def function_call_named_args(stat: tf.FunctionCallStatement, ctx: Context, setti
     #   depends on the field name, not the type name, which may vary between usages)
     # - the method name is excluded (this is pretty broad, and you may exclude methods
     #   of other function blocks with the same name accidentally)
+    nameless_arg_methods = settings.nameless_arg_methods
     if base_typ is not None:
         meth_info = f"{base_typ}:{meth_name}"
         # todo: check for inheritance
-        if (base_typ, meth_name) in settings.nameless_arg_methods:
+        pair = (str(base_typ), str(meth_name))
+        if ctx.get_settings_name(nameless_arg_methods, pair) is not None:
             return
-    if str(stat.name) in settings.nameless_arg_methods:
+    if ctx.get_settings_name(nameless_arg_methods, stat_name) is not None:
         return
-    if meth_name in settings.nameless_arg_methods:
+    if (
+        meth_name is not None
+        and ctx.get_settings_name(nameless_arg_methods, str(meth_name)) is not None
+    ):
         return
 
-    for param in stat.parameters:
-        if isinstance(param, tf.InputParameterAssignment) and param.name is None:
-            msg = f"Unnamed parameter in function call to {stat.name}"
-            if meth_info is not None:
-                msg += f" (function block method {meth_info})"
-            yield ErrorInfo(message=msg, violating=param)
+    msg = f"Unnamed parameter in function call to {name}"
+    if meth_info is not None:
+        msg += f" (function block method {meth_info})"
+    for param in unnamed:
+        yield ErrorInfo(message=msg, violating=param)
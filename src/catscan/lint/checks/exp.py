@@ -13,7 +13,7 @@ def unsigned_underflow(expr: tf.BinaryOperation, ctx: Context):
     if expr.op != "-":
         return
 
-    if ctx.get_expr_type(expr) in tc3.BUILTIN_UNSIGNED_INTEGERS:
+    if ctx.get_expr_type(expr) in tc3.BUILTIN_UNSIGNED_INTEGER_SET:
         yield ErrorInfo(
             message="Potential unsigned integer underflow in subtraction expression",
             violating=expr,
@@ -6,7 +6,7 @@ from catscan.lint.context import Context
 from catscan.lint.error import ErrorInfo
 from catscan.settings import Settings
 from catscan.utils import tc3
-from catscan.utils.program import all_subexpressions
+from catscan.utils.program import find_super_call
 from catscan.utils.tc3 import is_abstract
 
 
@@ -15,7 +15,8 @@ def function_exists(stat: tf.FunctionCallStatement, ctx: Context, settings: Sett
     """Check if all called functions exist, and have the right capitalization."""
     if isinstance(stat.name, tf.SimpleVariable):
         func_name = stat.name.name
-        if func_name in settings.builtin_functions:
+        builtin_name = ctx.get_settings_name(settings.builtin_functions, func_name)
+        if builtin_name == func_name:
             return
 
         try:
@@ -24,11 +25,7 @@ def function_exists(stat: tf.FunctionCallStatement, ctx: Context, settings: Sett
             return
 
         if var_type is None:
-            suggestion = (
-                func_name.upper()
-                if func_name.upper() in settings.builtin_functions
-                else ctx.get_var_suggestion(func_name)
-            )
+            suggestion = builtin_name or ctx.get_var_suggestion(func_name)
             msg = f"Function {func_name} not found"
             if suggestion is not None:
                 msg += f", did you mean '{suggestion}'?"
@@ -85,18 +82,7 @@ def super_call_when_possible(meth: MethodSummary, ctx: Context):
         # abstract super method, so no super call expected
         return
 
-    for subexpr in all_subexpressions(meth):
-        if isinstance(subexpr, tf.FunctionCall):
-            if isinstance(subexpr.name, tf.MultiElementVariable):
-                is_super_call = (
-                    tc3.is_super(subexpr.name.name.name)  # SUPER.<something>
-                    and len(subexpr.name.elements) == 1
-                    and isinstance(subexpr.name.elements[0], tf.FieldSelector)
-                    and tc3.streq(subexpr.name.elements[0].field.name, meth.name)
-                )
-                if is_super_call:
-                    break
-    else:
+    if not find_super_call(meth, meth.name):
         yield ErrorInfo(
             message=(
                 f"Missing super call in method {meth.name} of function block {fb.name} "
@@ -120,13 +106,7 @@ def super_call_in_function_block(fb: FunctionBlockSummary, ctx: Context):
     if non_abstract_super is None:
         return
 
-    for subexpr in all_subexpressions(fb.implementation):
-        if isinstance(subexpr, tf.FunctionCall):
-            if isinstance(subexpr.name, tf.SimpleVariable):
-                is_super_call = tc3.is_super(subexpr.name.name)
-                if is_super_call:
-                    break
-    else:
+    if not find_super_call(fb.implementation):
         yield ErrorInfo(
             message=(
                 f"Missing super call in function block {fb.name} body (is non-abstract and "
@@ -1,5 +1,5 @@
 import blark.transform as tf
-from blark.summary import DeclarationSummary, MethodSummary
+from blark.summary import MethodSummary
 
 from catscan.lint.base import lint_check
 from catscan.lint.error import ErrorInfo
@@ -33,30 +33,30 @@ def method_not_only_super(meth: MethodSummary):
 
                 def _is_passthrough_arg(
                     param: tf.InputParameterAssignment,
-                    arg: DeclarationSummary,
+                    arg_name: str,
                 ) -> bool:
-                    return isinstance(param.value, tf.SimpleVariable) and tc3.streq(
-                        param.value.name, arg.name
+                    """Check whether the parameter passes the (lowercase) argument name"""
+                    return (
+                        isinstance(param.value, tf.SimpleVariable)
+                        and str(param.value.name).lower() == arg_name
                     )
 
-                is_direct_call = True
+                # argument names are compared case-insensitively, so lower them only once
+                arg_names = [str(arg.name).lower() for arg in meth_inp_args.values()]
+
                 if any(param.name for param in stat.parameters):
                     # named parameters used
-                    stat_params = {str(param.name): param for param in stat.parameters}
-                    if {str(arg.name) for arg in meth_inp_args.values()} != set(stat_params):
-                        is_direct_call = False
-                    else:
-                        for arg in meth_inp_args.values():
-                            if not _is_passthrough_arg(stat_params[str(arg.name)], arg):
-                                is_direct_call = False
-                                break
+                    stat_params = {str(param.name).lower(): param for param in stat.parameters}
+                    is_direct_call = stat_params.keys() == set(arg_names) and all(
+                        _is_passthrough_arg(stat_params[arg_name], arg_name)
+                        for arg_name in arg_names
+                    )
                 else:
                     # unnamed parameters
-                    zipped = zip(meth_inp_args.values(), stat.parameters, strict=False)
-                    for meth_arg, param in zipped:
-                        if not _is_passthrough_arg(param, meth_arg):
-                            is_direct_call = False
-                            break
+                    is_direct_call = all(
+                        _is_passthrough_arg(param, arg_name)
+                        for arg_name, param in zip(arg_names, stat.parameters, strict=False)
+                    )
 
                 if is_direct_call:
                     yield ErrorInfo(
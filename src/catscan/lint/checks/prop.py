@@ -3,10 +3,9 @@ from blark.summary import PropertySummary
 
 from catscan.lint.base import lint_check
 from catscan.lint.error import ErrorInfo
-from catscan.utils import tc3
 from catscan.utils.program import (
-    all_subexpressions,
-    get_statements,
+    cached_statements,
+    cached_subexpressions,
     is_assignment_for,
 )
 
@@ -15,9 +14,10 @@ from catscan.utils.program import (
 def prop_setter_reads_set_value(prop: PropertySummary):
     """Check whether the property setter value is actually read."""
     if prop.setter.implementation:
-        for subexpr in all_subexpressions(prop.setter):
-            is_prop_setter_read = isinstance(subexpr, tf.SimpleVariable) and tc3.streq(
-                subexpr.name, prop.name
+        prop_name = str(prop.name).lower()
+        for subexpr in cached_subexpressions(prop.setter):
+            is_prop_setter_read = isinstance(subexpr, tf.SimpleVariable) and (
+                str(subexpr.name).lower() == prop_name
             )
             if is_prop_setter_read:
                 return
@@ -29,7 +29,7 @@ def prop_setter_reads_set_value(prop: PropertySummary):
 def prop_setter_value_not_written_to(prop: PropertySummary):
     """Check whether the property setter value is never written to."""
     if prop.setter.implementation:
-        for stat in get_statements(prop.setter):
+        for stat in cached_statements(prop.setter):
             if is_assignment_for(prop.name, stat, adr_is_assignment=False):
                 yield ErrorInfo(
                     message=f"Property setter variable '{prop.name}' is written to",
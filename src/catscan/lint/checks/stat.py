@@ -25,7 +25,11 @@ def case_statement_cases(stat: tf.CaseStatement, ctx: Context):
     if not isinstance(expr_type, tf.EnumeratedTypeDeclaration):
         return
 
-    enum_values = {str(value.name) for value in expr_type.init.spec.values}
+    # enumerated values are dotted identifiers, which we index case-insensitively
+    enum_values = {
+        f"{expr_type.name}.{value.name}".lower(): str(value.name)
+        for value in expr_type.init.spec.values
+    }
     for case in stat.cases:
         for match in case.matches:
             if not isinstance(match, tf.EnumeratedValue):
@@ -34,12 +38,7 @@ def case_statement_cases(stat: tf.CaseStatement, ctx: Context):
                 )
                 continue
 
-            for val in enum_values:
-                # enumerated values are dotted identifiers
-                if tc3.streq(match.name, f"{expr_type.name}.{val}"):
-                    enum_values.remove(val)
-                    break
-            else:
+            if enum_values.pop(str(match.name).lower(), None) is None:
                 logger.warning(
                     f"Found unknown enumerated value for enum {expr_type.name}: {match}"
                 )
@@ -48,7 +47,7 @@ def case_statement_cases(stat: tf.CaseStatement, ctx: Context):
         yield ErrorInfo(
             message=(
                 f"Case statement without else clause is missing cases for enum type "
-                f"{expr_type.name} (missing values {enum_values})"
+                f"{expr_type.name} (missing values {set(enum_values.values())})"
             ),
             violating=stat,
         )
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 import blark.transform as tf
 from blark.summary import (
@@ -11,16 +12,15 @@ from catscan.lint.error import ErrorInfo
 from catscan.settings import Settings
 from catscan.utils import log, tc3
 from catscan.utils.program import (
-    get_expressions,
-    get_subexpressions,
+    get_statement_subexpressions,
     has_assignment_before,
     is_assignment_for,
 )
 from catscan.utils.tc3 import (
     get_array_dims_and_base_type,
     get_reference_base_type,
-    is_array,
-    is_reference,
+    match_array,
+    match_reference,
 )
 
 logger = log.get_logger()
@@ -56,35 +56,51 @@ def _is_camel_case(s: str) -> bool:
     return s[0].isupper() and s != s.upper() and "_" not in s
 
 
+@lru_cache(maxsize=16)
+def _compile_type_prefixes(
+    type_prefixes: tuple[tuple[str, str], ...],
+) -> tuple[tuple[re.Pattern, str], ...]:
+    """Compile the type prefix patterns from the settings (in order)"""
+    return tuple((re.compile(typ_re), prefix) for typ_re, prefix in type_prefixes)
+
+
 def _get_type_prefix(typ: str, ctx: Context, settings: Settings) -> str | None:
-    """Get type prefix for variable."""
+    """Get type prefix for variable (cached in the context, as many declarations share the
+    same types)."""
+    cache = ctx._type_prefix_cache
+    if typ not in cache:
+        cache[typ] = _find_type_prefix(typ, ctx, settings)
+    return cache[typ]
+
+
+def _find_type_prefix(typ: str, ctx: Context, settings: Settings) -> str | None:
     # function blocks may be called (i.e. FB_ValueState(Input1 := ..., ...)
     typ, *_ = typ.split("(", maxsplit=1)
-    if is_array(typ):
-        _, base_typ = get_array_dims_and_base_type(typ)
+    if (array_match := match_array(typ)) is not None:
+        _, base_typ = get_array_dims_and_base_type(array_match)
         base_prefix = _get_type_prefix(base_typ, ctx, settings)
         if base_prefix is None:
             return None
 
         # nested arrays will still only have a single 'a' name prefix
         arr_prefix = settings.array_prefix or ""
-        return arr_prefix + base_prefix.lstrip(arr_prefix)
+        return arr_prefix + base_prefix.removeprefix(arr_prefix)
 
-    if is_reference(typ):
-        base_typ = get_reference_base_type(typ)
+    if (reference_match := match_reference(typ)) is not None:
+        base_typ = get_reference_base_type(reference_match)
         base_prefix = _get_type_prefix(base_typ, ctx, settings)
         if base_prefix is None:
             return None
 
         # can REFERENCE TO REFERENCE TO even happen?
         ref_prefix = settings.reference_prefix or ""
-        return ref_prefix + base_prefix.lstrip(ref_prefix)
+        return ref_prefix + base_prefix.removeprefix(ref_prefix)
 
     prefix = settings.type_prefixes.get(typ)
     if prefix is not None:
         return prefix
-    for typ_re, prefix in settings.type_prefixes.items():
-        if re.match(typ_re, typ):
+    for typ_re, prefix in _compile_type_prefixes(tuple(settings.type_prefixes.items())):
+        if typ_re.match(typ):
             return prefix
     if typ in ctx.code.function_blocks and settings.function_block_prefix is not None:
         return settings.function_block_prefix
@@ -125,7 +141,7 @@ def declaration_naming_convention(decl: DeclarationSummary, ctx: Context, settin
     else:
         prefixes = {prefix + type_prefix for prefix in prefixes}
 
-    if not any(var_name.startswith(prefix) for prefix in prefixes):
+    if not var_name.startswith(tuple(prefixes)):
         yield ErrorInfo(
             message=(
                 f"Variable {decl.name} of type {decl.type} should start with any of "
@@ -143,12 +159,8 @@ def uninitialized_var_read(stat: tf.Statement, ctx: Context):
     if ctx.current_method is None:
         return
 
-    # the 'candidate' variables which are not initialized
-    uninitialized_vars = [
-        var
-        for var, decl in ctx.current_method.declarations.items()
-        if not tc3.decl_is_initialized(decl)
-    ]
+    # the 'candidate' variables which are not initialized (lower-case)
+    uninitialized_vars = ctx.uninitialized_vars
     if not uninitialized_vars:
         return
 
@@ -157,23 +169,22 @@ def uninitialized_var_read(stat: tf.Statement, ctx: Context):
     def _exclude_queryinterface(_expr: tf.Expression) -> bool:
         return tc3.is_call_to(_expr, "__QUERYINTERFACE")
 
-    for expr in get_expressions(stat):
-        for subexpr in get_subexpressions(expr, exclude=_exclude_queryinterface):
-            if not isinstance(subexpr, tf.SimpleVariable):
-                continue
-
-            # check if variable may be uninitialized
-            var_name = str(subexpr.name)
-            if not any(tc3.streq(var_name, v) for v in uninitialized_vars):
-                continue
-
-            # the subexpression may be the assignment part of an assignment statement
-            # todo: x = x must also be checked
-            if is_assignment_for(var_name, stat):
-                continue
-
-            if not has_assignment_before(stat, ctx.current_method, var_name):
-                yield ErrorInfo(
-                    message=f"Variable {var_name} may be read before it is assigned to",
-                    violating=subexpr,
-                )
+    for subexpr in get_statement_subexpressions(stat, exclude=_exclude_queryinterface):
+        if not isinstance(subexpr, tf.SimpleVariable):
+            continue
+
+        # check if variable may be uninitialized
+        var_name = str(subexpr.name)
+        if var_name.lower() not in uninitialized_vars:
+            continue
+
+        # the subexpression may be the assignment part of an assignment statement
+        # todo: x = x must also be checked
+        if is_assignment_for(var_name, stat):
+            continue
+
+        if not has_assignment_before(stat, ctx.current_method, var_name):
+            yield ErrorInfo(
+                message=f"Variable {var_name} may be read before it is assigned to",
+                violating=subexpr,
+            )
@@ -1,23 +1,24 @@
+import difflib
 from collections.abc import Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import TypeVar
+from typing import Any, TypeVar
 
 import blark.transform as tf
 from blark.summary import (
     CodeSummary,
+    DataTypeSummary,
     DeclarationSummary,
     FunctionBlockSummary,
     MethodSummary,
     PropertyGetSetSummary,
+    PropertySummary,
 )
 
 from catscan.settings import Settings
 from catscan.utils import log, tc3
 from catscan.utils.tc3 import (
     get_array_dims_and_base_type,
-    get_case_insensitive,
-    get_case_insensitive_with_fixed_key,
     streq,
 )
 
@@ -27,11 +28,61 @@ _T = TypeVar("_T")
 
 ComplexType = object()
 
+# special symbols in function blocks (in upper case)
+_THIS_SYMBOLS = frozenset({"THIS", "THIS^"})
+_SUPER_SYMBOLS = frozenset({"SUPER", "SUPER^"})
+
+
+DEFAULT_ARITHMETIC_TYPES = {
+    tf.Integer: "INT",
+    tf.Real: "LREAL",
+    tf.Boolean: "BOOLEAN",
+    tf.Duration: "TIME",
+    tf.Lduration: "LTIME",
+    tf.TimeOfDay: "TIME_OF_DAY",
+    tf.LtimeOfDay: "LTIME_OF_DAY",
+    tf.Date: "DATE",
+    tf.Ldate: "LDATE",
+    tf.DateTime: "DATE_AND_TIME",
+    tf.LdateTime: "LDATE_AND_TIME",
+    tf.String: "STRING",
+    # tf.BitString:  None,  # todo: what is the default here?
+}
+
+# operators by the type of their result
+_SIGN_OPERATORS = frozenset({"-", "+"})
+_BOOLEAN_OPERATORS = frozenset(
+    {"OR", "XOR", "AND", "AND_THEN", "OR_ELSE", "=", "<>", "<=", ">=", "<", ">"}
+)
+_ARITHMETIC_OPERATORS = frozenset({"+", "-", "*", "/"})
+
+# default types resolved per concrete expression type (subclasses included), or None
+_DEFAULT_EXPR_TYPES: dict[type, str | None] = {}
+
+
+def _lower_key(key: str | tuple[str, ...]) -> str | tuple[str, ...]:
+    if isinstance(key, tuple):
+        return tuple(str(k).lower() for k in key)
+    return str(key).lower()
 
-def _push_stack_context(stack: list[_T], item: _T):
-    stack.append(item)
-    yield
-    stack.pop()
+
+def _get_name_prefix(name: str) -> str:
+    """Get the prefix of a name (e.g. the F of F_Test), or an empty string if it has none"""
+    prefix, sep, _ = name.partition("_")
+    return prefix if sep else ""
+
+
+def _get_default_expr_type(typ: type) -> str | None:
+    if typ not in _DEFAULT_EXPR_TYPES:
+        _DEFAULT_EXPR_TYPES[typ] = next(
+            (
+                default
+                for expr_typ, default in DEFAULT_ARITHMETIC_TYPES.items()
+                if issubclass(typ, expr_typ)
+            ),
+            None,
+        )
+    return _DEFAULT_EXPR_TYPES[typ]
 
 
 @dataclass
@@ -43,6 +94,42 @@ class Context:
     _current_fb: FunctionBlockSummary | None = None
     _current_method: MethodSummary | PropertyGetSetSummary | None = None
 
+    # expression types by expression id, expressions are stored as well so they are kept alive
+    # (each expression only occurs in a single context, so the type is fixed)
+    _expr_types: dict[int, tuple[tf.Expression, str | None]] = field(
+        default_factory=dict, repr=False
+    )
+
+    # lower-case indices of dicts / sets used for case-insensitive lookups, by id of the
+    # collection (which is stored as well, to keep it alive)
+    _ci_indices: dict[int, tuple[Any, dict[Any, tuple[Any, Any]]]] = field(
+        default_factory=dict, repr=False
+    )
+
+    # squashed function blocks / data types and function block declaration types by id of the
+    # (unsquashed) summary, the code does not change while linting
+    _squashed: dict[int, tuple[FunctionBlockSummary | DataTypeSummary, Any]] = field(
+        default_factory=dict, repr=False
+    )
+    _fb_decl_types: dict[int, tuple[FunctionBlockSummary, dict]] = field(
+        default_factory=dict, repr=False
+    )
+    _fb_properties: dict[int, tuple[FunctionBlockSummary, dict[str, PropertySummary]]] = field(
+        default_factory=dict, repr=False
+    )
+
+    # type prefixes for declaration types, see VAR002
+    _type_prefix_cache: dict[str, str | None] = field(default_factory=dict, repr=False)
+
+    # variable lookups by (name, strict) and names visible in the current function block or
+    # method context, these are reset whenever a function block or method context is entered or
+    # left
+    _var_types: dict[tuple[str, bool], tuple[str | None, str | type(ComplexType) | None]] = (
+        field(default_factory=dict, repr=False)
+    )
+    _scope_names: dict[str, dict[str, str]] | None = field(default=None, repr=False)
+    _uninitialized_vars: frozenset[str] | None = field(default=None, repr=False)
+
     def __post_init__(self):
         # collect all globals and add them to the variable stack
         _globals = {}
@@ -77,24 +164,56 @@ class Context:
     def get_field_type(self, base_typ: str, field: str) -> str | None:
         if base_typ in self.code.function_blocks:
             base_fb = self.code.function_blocks[base_typ]
-            squashed_fb = base_fb.squash_base_extends(self.code.function_blocks)
+            squashed_fb = self._get_squashed(base_fb)
             _field = squashed_fb.declarations.get(field)
             if _field is None:
-                for prop in squashed_fb.properties:
-                    if streq(prop.name, field):
-                        # todo: this is actually a more complex structure
-                        return str(prop.getter.item.return_type)
+                _, prop = self._get_case_insensitive(self._get_fb_properties(base_fb), field)
+                if prop is not None:
+                    # todo: this is actually a more complex structure
+                    return str(prop.getter.item.return_type)
                 return None
             return _field.type
         elif base_typ in self.code.data_types:
             base_dt = self.code.data_types[base_typ]
-            squashed_dt = base_dt.squash_base_extends(self.code.data_types)
+            squashed_dt = self._get_squashed(base_dt)
             _field = squashed_dt.declarations.get(field)
             if _field is None:
                 return None
             return _field.type
         return None
 
+    def _get_case_insensitive_index(self, coll: Any) -> dict[Any, tuple[Any, Any]]:
+        """Get a lower-case index of a dict (keys to items) or set (keys to (key, None)) of
+        strings or tuples of strings. The collections looked up in do not change while
+        linting."""
+        cached = self._ci_indices.get(id(coll))
+        if cached is None:
+            items = coll.items() if isinstance(coll, dict) else ((k, None) for k in coll)
+            index = {}
+            for k, v in items:
+                # the first matching key wins, like in get_case_insensitive_with_fixed_key
+                index.setdefault(_lower_key(k), (k, v))
+            cached = self._ci_indices[id(coll)] = (coll, index)
+        return cached[1]
+
+    def _get_case_insensitive(
+        self, dct: dict[str, _T], key: str
+    ) -> tuple[str | None, _T | None]:
+        """Same as get_case_insensitive_with_fixed_key, but using a lower-case index of the
+        dict"""
+        if key in dct:
+            return key, dct[key]
+        if key is None:
+            return None, None
+        return self._get_case_insensitive_index(dct).get(str(key).lower(), (None, None))
+
+    def get_settings_name(
+        self, names: set[str] | set[str | tuple[str, str]], name: str | tuple[str, str]
+    ) -> str | tuple[str, str] | None:
+        """Get a name (or tuple of names) as spelled in a collection of names from the
+        settings, matched case-insensitively, or None if it is not in the collection"""
+        return self._get_case_insensitive_index(names).get(_lower_key(name), (None, None))[0]
+
     def _get_var_type(
         self,
         var: str,
@@ -105,57 +224,67 @@ class Context:
         being used anywhere. Function objects are also not parsed as being a sub expression
         with get_subexpressions. Returns the variable type as well as the fixed variable name
         (which will always just be the input var argument if strict mode is enabled."""
-
+        key = (str(var), strict)
+        result = self._var_types.get(key)
+        if result is None:
+            result = self._lookup_var_type(var, strict)
+            self._var_types[key] = result
+        return result
+
+    def _lookup_var_type(
+        self,
+        var: str,
+        strict: bool,
+    ) -> tuple[str | None, str | type(ComplexType) | None]:
         def _dict_getter(d: dict[str, _T], k: str) -> tuple[str | None, _T | None]:
             if strict:
                 return k, d.get(k)
             else:
-                return get_case_insensitive_with_fixed_key(d, str(k))
+                return self._get_case_insensitive(d, str(k))
 
         def _streq(s1: str, s2: str) -> bool:
             return str(s1) == str(s2) if strict else streq(s1, s2)
 
         # first check THIS and other builtins (TRUE, FALSE, etc.)
-        for this in ("THIS", "THIS^"):
-            if _streq(str(var), this):
-                if self._current_fb is None:
-                    msg = "THIS used outside of function block"
-                    raise TypeError(msg)
-                return this, self._current_fb.name
-        for supr in ("SUPER", "SUPER^"):
-            if _streq(str(var), supr):
-                if self._current_fb is None:
-                    msg = "SUPER used outside of function block"
-                    raise TypeError(msg)
-
-                if self._current_method is None:
-                    # must be in function block body, so I guess just take the first extension?
-                    # not sure how multiple inheritance works here
-                    return supr, str(self._current_fb.extends[0])
-
-                # find correct extension by checking the methods that are implemented for this
-                # extension
-                for ext in self._current_fb.extends:
-                    _, ext_fb = _dict_getter(self.code.function_blocks, ext)
-                    if ext_fb is not None:
-                        # todo: actually, squashing is not entirely correct, as the type of
-                        # SUPER^ would be that of the first function block with the
-                        # implementation in the inheritance structure (I think), while this may
-                        # find some intermediate function block type
-                        squashed_ext_fb = ext_fb.squash_base_extends(self.code.function_blocks)
-                        meth = next(
-                            (
-                                meth
-                                for meth in squashed_ext_fb.methods + squashed_ext_fb.properties
-                                if _streq(meth.name, self._current_method.name)
-                            ),
-                            None,
-                        )
-                        if meth is not None:
-                            return supr, str(ext)
-                # proper extension not found
-                logger.warning(f"Failed to find type of SUPER in {self.current_loc}")
-                return supr, None
+        special = str(var) if strict else str(var).upper()
+        if special in _THIS_SYMBOLS:
+            if self._current_fb is None:
+                msg = "THIS used outside of function block"
+                raise TypeError(msg)
+            return special, self._current_fb.name
+        if special in _SUPER_SYMBOLS:
+            if self._current_fb is None:
+                msg = "SUPER used outside of function block"
+                raise TypeError(msg)
+
+            if self._current_method is None:
+                # must be in function block body, so I guess just take the first extension?
+                # not sure how multiple inheritance works here
+                return special, str(self._current_fb.extends[0])
+
+            # find correct extension by checking the methods that are implemented for this
+            # extension
+            for ext in self._current_fb.extends:
+                _, ext_fb = _dict_getter(self.code.function_blocks, ext)
+                if ext_fb is not None:
+                    # todo: actually, squashing is not entirely correct, as the type of
+                    # SUPER^ would be that of the first function block with the
+                    # implementation in the inheritance structure (I think), while this may
+                    # find some intermediate function block type
+                    squashed_ext_fb = self._get_squashed(ext_fb)
+                    meth = next(
+                        (
+                            meth
+                            for meth in squashed_ext_fb.methods + squashed_ext_fb.properties
+                            if _streq(meth.name, self._current_method.name)
+                        ),
+                        None,
+                    )
+                    if meth is not None:
+                        return special, str(ext)
+            # proper extension not found
+            logger.warning(f"Failed to find type of SUPER in {self.current_loc}")
+            return special, None
 
         # builtin symbols may have some type as well
         k, typ = _dict_getter(self.settings.builtin_symbols, var)
@@ -207,7 +336,31 @@ class Context:
     def get_var_suggestion(self, var: str) -> str | None:
         """Try to suggest a close variable name for a variable that may not exist or be
         capitalized in the wrong way."""
-        return self._get_var_type(var, strict=False)[0]
+        fixed_var = self._get_var_type(var, strict=False)[0]
+        if fixed_var is not None:
+            return fixed_var
+
+        # not found at all, so maybe there is a typo
+        if self._scope_names is None:
+            # later names take precedence, in the same order as variable lookups. The current
+            # method is left out, as a call to it is never a typo of another name
+            names = list(self.code.functions)
+            for layer in self.var_stack:
+                names.extend(layer)
+            if self._current_fb is not None:
+                names.extend(self._get_fb_decl_types(self._current_fb))
+            self._scope_names = {}
+            for name in names:
+                lower_name = str(name).lower()
+                prefix_names = self._scope_names.setdefault(_get_name_prefix(lower_name), {})
+                prefix_names[lower_name] = str(name)
+
+        # names with another prefix (e.g. F_Test and m_Test) are different kinds of objects, no
+        # matter how close the names are
+        lower_var = str(var).lower()
+        candidates = self._scope_names.get(_get_name_prefix(lower_var), {})
+        matches = difflib.get_close_matches(lower_var, candidates, n=1, cutoff=0.8)
+        return candidates[matches[0]] if matches else None
 
     def get_multi_element_type(
         self, name: str, elements: list[tf.SubscriptList | tf.FieldSelector]
@@ -234,30 +387,20 @@ class Context:
 
     def get_expr_type(self, expr: tf.Expression) -> str | None:
         """Try to determine the type of a (transformed) blark expression."""
+        cached = self._expr_types.get(id(expr))
+        if cached is not None:
+            return cached[1]
+        typ = self._get_expr_type(expr)
+        self._expr_types[id(expr)] = (expr, typ)
+        return typ
 
+    def _get_expr_type(self, expr: tf.Expression) -> str | None:
         # supported by tf.Integer, Real, BitString,
         if type_name := getattr(expr, "type_name", None):
             return type_name
 
-        default_arithmetic_types = {
-            tf.Integer: "INT",
-            tf.Real: "LREAL",
-            tf.Boolean: "BOOLEAN",
-            tf.Duration: "TIME",
-            tf.Lduration: "LTIME",
-            tf.TimeOfDay: "TIME_OF_DAY",
-            tf.LtimeOfDay: "LTIME_OF_DAY",
-            tf.Date: "DATE",
-            tf.Ldate: "LDATE",
-            tf.DateTime: "DATE_AND_TIME",
-            tf.LdateTime: "LDATE_AND_TIME",
-            tf.String: "STRING",
-            # tf.BitString:  None,  # todo: what is the default here?
-        }
-
-        for expr_typ, default in default_arithmetic_types.items():
-            if isinstance(expr, expr_typ):
-                return default
+        if default := _get_default_expr_type(type(expr)):
+            return default
         if isinstance(expr, tf.DirectVariable):
             raise NotImplementedError
         elif isinstance(expr, tf.SimpleVariable):
@@ -265,47 +408,33 @@ class Context:
         elif isinstance(expr, tf.MultiElementVariable):
             return self.get_multi_element_type(str(expr.name), expr.elements)
         elif isinstance(expr, tf.UnaryOperation):
-            match str(expr.op):
-                case "NOT":
-                    return "BOOLEAN"
-                case "-" | "+":
-                    return self.get_expr_type(expr.expr)
-                case _:
-                    raise NotImplementedError
+            op = str(expr.op)
+            if op == "NOT":
+                return "BOOLEAN"
+            elif op in _SIGN_OPERATORS:
+                return self.get_expr_type(expr.expr)
+            raise NotImplementedError
         elif isinstance(expr, tf.BinaryOperation):
-            match str(expr.op):
-                case (
-                    "OR"
-                    | "XOR"
-                    | "AND"
-                    | "AND_THEN"
-                    | "OR_ELSE"
-                    | "="
-                    | "<>"
-                    | "<="
-                    | ">="
-                    | "<"
-                    | ">"
-                ):
-                    return "BOOLEAN"
-                case "MOD":
-                    return self.get_expr_type(expr.left)
-                case "+" | "-" | "*" | "/":
-                    ltyp = self.get_expr_type(expr.left)
-                    rtyp = self.get_expr_type(expr.right)
-                    return tc3.common_arithmetic_type(ltyp, rtyp)
-                case _:
-                    raise NotImplementedError
+            op = str(expr.op)
+            if op in _BOOLEAN_OPERATORS:
+                return "BOOLEAN"
+            elif op == "MOD":
+                return self.get_expr_type(expr.left)
+            elif op in _ARITHMETIC_OPERATORS:
+                ltyp = self.get_expr_type(expr.left)
+                rtyp = self.get_expr_type(expr.right)
+                return tc3.common_arithmetic_type(ltyp, rtyp)
+            raise NotImplementedError
         elif isinstance(expr, tf.ParenthesizedExpression | tf.BracketedExpression):
             # NOTE: bracketed expression is EXCLUSIVELY used for string length specifications
             return self.get_expr_type(expr.expr)
         elif isinstance(expr, tf.FunctionCall):
             funcname = str(expr.name.name)
-            if conv_to := get_case_insensitive(tc3.BUILTIN_TYPE_CONVERSIONS, funcname):
+            if conv_to := self._get_case_insensitive(tc3.BUILTIN_TYPE_CONVERSIONS, funcname)[1]:
                 return conv_to
-            if builtin_ret := get_case_insensitive(tc3.BUILTIN_FUNCTIONS, funcname):
+            if builtin_ret := self._get_case_insensitive(tc3.BUILTIN_FUNCTIONS, funcname)[1]:
                 return builtin_ret
-            if func := get_case_insensitive(self.code.functions, funcname):
+            if func := self._get_case_insensitive(self.code.functions, funcname)[1]:
                 return func.return_type
             if isinstance(fb := self.get_var_type(funcname), str):
                 # function block call
@@ -318,29 +447,76 @@ class Context:
         fb: FunctionBlockSummary,
         with_self: bool = True,
     ) -> Iterator[FunctionBlockSummary]:
-        """Get entire inheritance structure of function block"""
-        if with_self:
-            yield fb
-        for ext in fb.extends or []:
-            ext_fb = tc3.get_case_insensitive(self.code.function_blocks, ext)
-            if ext_fb is not None:
-                # always include self in this case, as it should return the entire structure
-                yield from self.get_all_extends(ext_fb, with_self=True)
+        """Get entire inheritance structure of function block (depth-first, each function block
+        is only yielded once)"""
+        todo = [(fb, with_self)]
+        visited = set()
+        while todo:
+            fb, include = todo.pop()
+            if id(fb) in visited:
+                continue
+            visited.add(id(fb))
+            if include:
+                yield fb
+
+            ext_fbs = []
+            for ext in fb.extends or []:
+                _, ext_fb = self._get_case_insensitive(self.code.function_blocks, ext)
+                if ext_fb is not None:
+                    # always include extensions, as it should return the entire structure
+                    ext_fbs.append((ext_fb, True))
+                else:
+                    logger.warning(
+                        f"Failed to get function block extension '{ext}' for {fb.name}"
+                    )
+            # pushed in reverse, to keep the declaration order
+            todo.extend(reversed(ext_fbs))
+
+    def _get_squashed(self, obj: FunctionBlockSummary | DataTypeSummary):
+        """Get a function block or data type with its base extensions squashed into it"""
+        cached = self._squashed.get(id(obj))
+        if cached is None:
+            if isinstance(obj, FunctionBlockSummary):
+                squashed = obj.squash_base_extends(self.code.function_blocks)
             else:
-                logger.warning(f"Failed to get function block extension '{ext}' for {fb.name}")
+                squashed = obj.squash_base_extends(self.code.data_types)
+            cached = self._squashed[id(obj)] = (obj, squashed)
+        return cached[1]
+
+    def _get_fb_properties(self, fb: FunctionBlockSummary) -> dict[str, PropertySummary]:
+        """Get properties of a function block (including inherited properties) by name"""
+        cached = self._fb_properties.get(id(fb))
+        if cached is None:
+            props = {}
+            for prop in self._get_squashed(fb).properties:
+                # the first property with a name wins, like a search through the properties
+                props.setdefault(str(prop.name), prop)
+            cached = self._fb_properties[id(fb)] = (fb, props)
+        return cached[1]
 
     def _get_fb_decl_types(
         self, fb: FunctionBlockSummary
     ) -> dict[str, str | type(ComplexType)]:
         """Get field names for a function block definition (including inherited fields)"""
-        squashed = fb.squash_base_extends(self.code.function_blocks)
+        cached = self._fb_decl_types.get(id(fb))
+        if cached is not None:
+            return cached[1]
+
+        squashed = self._get_squashed(fb)
         decls = {str(name): decl.type for name, decl in squashed.declarations.items()}
         props = {
             str(prop.name): prop.getter.item.return_type.full_type_name
             for prop in squashed.properties
         }
         methods = {str(method.name): ComplexType for method in squashed.methods}
-        return decls | props | methods
+        decl_types = decls | props | methods
+        self._fb_decl_types[id(fb)] = (fb, decl_types)
+        return decl_types
+
+    def _reset_scope(self):
+        self._var_types.clear()
+        self._scope_names = None
+        self._uninitialized_vars = None
 
     @property
     def current_function_block(self) -> FunctionBlockSummary | None:
@@ -350,19 +526,42 @@ class Context:
     def function_block(self, fb: FunctionBlockSummary):
         assert self._current_fb is None
         self._current_fb = fb
-        yield
-        # todo: unify this? it is annoying to deal with properties and declarations in the same
-        #       way. Perhaps we can extract some type info from both
-        # yield from _push_stack_context(self.var_stack, self._get_fb_declarations(fb))
-        self._current_fb = None
+        self._reset_scope()
+        try:
+            # todo: unify this? it is annoying to deal with properties and declarations in the
+            #       same way. Perhaps we can extract some type info from both, and push them on
+            #       the var stack like method declarations
+            yield
+        finally:
+            self._current_fb = None
+            self._reset_scope()
 
     @property
     def current_method(self) -> MethodSummary | PropertyGetSetSummary | None:
         return self._current_method
 
+    @property
+    def uninitialized_vars(self) -> frozenset[str]:
+        """Lower-case names of the variables of the current method that are not initialized in
+        their declaration"""
+        if self._uninitialized_vars is None:
+            declarations = self._current_method.declarations if self._current_method else {}
+            self._uninitialized_vars = frozenset(
+                str(var).lower()
+                for var, decl in declarations.items()
+                if not tc3.decl_is_initialized(decl)
+            )
+        return self._uninitialized_vars
+
     @contextmanager
     def method(self, method: MethodSummary | PropertyGetSetSummary):
         assert self._current_method is None
         self._current_method = method
-        yield from _push_stack_context(self.var_stack, method.declarations)
-        self._current_method = None
+        self._reset_scope()
+        self.var_stack.append(method.declarations)
+        try:
+            yield
+        finally:
+            self.var_stack.pop()
+            self._current_method = None
+            self._reset_scope()
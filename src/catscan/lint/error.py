@@ -1,5 +1,6 @@
 import linecache
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -13,7 +14,13 @@ from .context import Context
 logger = log.get_logger()
 
 
-@dataclass(kw_only=True)
+@lru_cache(maxsize=128)
+def _split_source(source: str) -> tuple[str, ...]:
+    """Split source code into lines, errors tend to be grouped in the same source"""
+    return tuple(source.split("\n"))
+
+
+@dataclass(kw_only=True, slots=True)
 class Location:
     file: Path  # source file for the error
     function_block: str | None = None  # may not be in function block
@@ -34,7 +41,7 @@ class Location:
             return None
         elif self.source is not None and self.line is not None:
             # source and line are passed
-            split_source = self.source.split("\n")
+            split_source = _split_source(self.source)
             if self.line > len(split_source):
                 # line out of range
                 logger.warning(
@@ -67,7 +74,7 @@ class Location:
             return result
         elif self.source is not None and self.line is not None:
             # source and line are passed
-            split_source = self.source.split("\n")
+            split_source = _split_source(self.source)
             start_line = max(self.line - max_context_size, 0)
             error_ctx_before = "\n".join(split_source[start_line : self.line])
             end_line = min(self.line + max_context_size, len(split_source))
@@ -90,11 +97,8 @@ class Location:
             # tabs may mess up cursor spacing
             err_line = source_ctx.rsplit("\n", maxsplit=1)[-1]
             source_ctx += "\n"
-            for i in range(min(col - 1, len(err_line))):
-                if err_line[i] == "\t":
-                    source_ctx += "\t"
-                else:
-                    source_ctx += " "
+            padding = err_line[: max(col - 1, 0)]
+            source_ctx += "".join("\t" if c == "\t" else " " for c in padding)
 
             if end_col is not None:
                 source_ctx += "^" * max(end_col - col, 1)
@@ -108,7 +112,7 @@ class Location:
         return result
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ErrorInfo:
     message: str
     ctx: Context | None = None
@@ -118,7 +122,7 @@ class ErrorInfo:
     file: Path | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class Error:
     code: str
     message: str
@@ -142,23 +146,25 @@ class Error:
         else:
             source = getattr(info.source_obj, "implementation_source", None)
 
-        return Error(
-            code=code,
-            message=info.message,
-            loc=Location(
-                file=info.file or info.source_obj.filename,
-                function_block=getattr(info.ctx.current_function_block, "name", None),
-                method=getattr(info.ctx.current_method, "name", None),
-                # todo: function
-                file_line=info.meta and info.meta.line,
-                file_col=info.meta and info.meta.column,
-                file_end_col=info.meta and info.meta.end_column,
-                source=source,
-                line=info.meta and info.meta.container_line,
-                col=info.meta and info.meta.container_column,
-                end_col=info.meta and info.meta.container_end_column,
-            ),
+        loc = Location(
+            file=info.file or info.source_obj.filename,
+            function_block=getattr(info.ctx.current_function_block, "name", None),
+            method=getattr(info.ctx.current_method, "name", None),
+            # todo: function
+            source=source,
         )
+        if (meta := info.meta) is not None:
+            loc.file_line, loc.file_col, loc.file_end_col = (
+                meta.line,
+                meta.column,
+                meta.end_column,
+            )
+            loc.line, loc.col, loc.end_col = (
+                meta.container_line,
+                meta.container_column,
+                meta.container_end_column,
+            )
+        return Error(code=code, message=info.message, loc=loc)
 
     def pretty_print(self, prefix: str | None):
         print("\033[31m", end="")  # noqa: T201
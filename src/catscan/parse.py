@@ -1,9 +1,15 @@
 """Basic parsing of TwinCAT code using blark, in parallel."""
 
+import atexit
 import concurrent.futures as fut
 import copyreg
 import hashlib
+import os
 import pickle
+import sys
+import threading
+import time
+from collections import deque
 from collections.abc import Iterable, Iterator
 from importlib.metadata import version
 from io import BytesIO
@@ -18,6 +24,12 @@ from .utils import log
 
 logger = log.get_logger()
 
+# parse results depend on the version of blark, so it is part of all cache keys. Looking up
+# the version reads package metadata, so only do so once. The source file hash is seeded with
+# it, and copied for every file.
+_BLARK_VERSION = version("blark")
+_SOURCE_HASH_SEED = hashlib.blake2b(_BLARK_VERSION.encode(), digest_size=32)
+
 """Pickling blark ParseResults requires some special attention: some objects seem to store the
 original XML data (elements or entire trees), which cannot be pickled by default. I don't think
 they are really used once the results have been parsed / transformed / summarized, but this does
@@ -28,10 +40,22 @@ https://stackoverflow.com/questions/25991860/
 """
 
 
+# lxml parsers cannot be shared between threads, so there is one per thread
+_XML_PARSERS = threading.local()
+
+
+def _get_xml_parser() -> etree.XMLParser:
+    parser = getattr(_XML_PARSERS, "parser", None)
+    if parser is None:
+        # huge_tree, as anything that was serialized should also be loaded again
+        parser = _XML_PARSERS.parser = etree.XMLParser(huge_tree=True)
+    return parser
+
+
 def _etree_unpkl(data):
     """Unpickle etree._ElementTree / etree._Element from bytes"""
     # I don't care about loading unsafe data here 🤪
-    return etree.parse(BytesIO(data))  # noqa: S320
+    return etree.parse(BytesIO(data), parser=_get_xml_parser())  # noqa: S320
 
 
 def _etree_pkl(tree: etree._ElementTree | etree._Element):
@@ -46,16 +70,16 @@ copyreg.pickle(etree._Element, _etree_pkl, _etree_unpkl)
 # Define pickling / unpickling functions for UnexpectedCharacters exception, which is raised
 # if invalid syntax is detected in a source file. This likely indicates missing features in the
 # blark grammar.
+# Only the state needed to report the error (i.e. str(exc)) is kept, the parser state and
+# considered tokens / rules are dropped, and of the terminals only the allowed ones are kept,
+# as the full terminal map of the grammar makes these exceptions large.
 def _unexp_char_unpkl(
     pos_in_stream,
     line,
     column,
     allowed,
-    considered_tokens,
-    state,
     token_history,
     _terminals_by_name,
-    considered_rules,
     char,
     _context,
 ) -> UnexpectedCharacters:
@@ -65,11 +89,11 @@ def _unexp_char_unpkl(
     dummy.line = line
     dummy.column = column
     dummy.allowed = allowed
-    dummy.considered_tokens = considered_tokens
-    dummy.state = state
+    dummy.considered_tokens = None
+    dummy.state = None
     dummy.token_history = token_history
     dummy._terminals_by_name = _terminals_by_name
-    dummy.considered_rules = considered_rules
+    dummy.considered_rules = None
     dummy.char = char
     dummy._context = _context
 
@@ -77,16 +101,16 @@ def _unexp_char_unpkl(
 
 
 def _unexp_char_pkl(exc: UnexpectedCharacters):
+    terminals = exc._terminals_by_name
+    if terminals and exc.allowed:
+        terminals = {name: terminals[name] for name in exc.allowed if name in terminals}
     state = (
         exc.pos_in_stream,
         exc.line,
         exc.column,
         exc.allowed,
-        exc.considered_tokens,
-        exc.state,
         exc.token_history,
-        exc._terminals_by_name,
-        exc.considered_rules,
+        terminals,
         exc.char,
         exc._context,
     )
@@ -96,12 +120,17 @@ def _unexp_char_pkl(exc: UnexpectedCharacters):
 copyreg.pickle(UnexpectedCharacters, _unexp_char_pkl, _unexp_char_unpkl)
 
 
-def get_all_source_items(file: Path) -> Iterator[BlarkSourceItem]:
-    """Get all (flattened) source items for this file"""
+def get_all_source_items(
+    file: Path, st: os.stat_result | None = None
+) -> Iterator[BlarkSourceItem]:
+    """Get all (flattened) source items for this file. The stat result of the file may be
+    passed if it is already known."""
 
     # there may be empty files, which of course contain no source items
     # the files seem to start with some byte marker though, so the file size is never 0...
-    if file.stat().st_size < 10:  # noqa: PLR2004
+    if st is None:
+        st = file.stat()
+    if st.st_size < 10:  # noqa: PLR2004
         return
 
     for item in load_file_by_name(file):
@@ -111,6 +140,74 @@ def get_all_source_items(file: Path) -> Iterator[BlarkSourceItem]:
             yield item
 
 
+# modification time granularity of the coarsest filesystems (FAT has 2 second timestamps)
+_RACY_MTIME_NS = 2_000_000_000
+
+
+def _get_cache_file(file: Path, cache_dir: Path, st: os.stat_result | None = None) -> Path:
+    """Get the cache file for the parse results of a source file"""
+    # the cache file name for the last seen modification time and size of a source file is
+    # stored in a small metadata file, so unchanged files do not have to be hashed
+    path_hash = hashlib.blake2b(
+        f"{_BLARK_VERSION}:{file.resolve()}".encode(), digest_size=8
+    ).hexdigest()
+    meta_file = cache_dir / f"{file.name}.{path_hash}.meta"
+    if st is None:
+        st = file.stat()
+    stamp = f"{st.st_mtime_ns} {st.st_size}"
+    try:
+        meta_stamp, cache_name = meta_file.read_text().splitlines()
+        if meta_stamp == stamp:
+            return cache_dir / cache_name
+    except (FileNotFoundError, ValueError):
+        pass
+
+    # hash source file
+    # we salt this with the version of blark that we are using, as it may affect the results
+    # the hash is only used as a cache key, so use the (faster) blake2b instead of sha256
+    # file_digest hashes the file in chunks, without reading it into memory entirely
+    with file.open("rb") as f:
+        file_hash = hashlib.file_digest(f, _SOURCE_HASH_SEED.copy)
+    cache_file = cache_dir / f"{file.name}.{file_hash.hexdigest()}.pkl"
+
+    # a file modified just now may be modified again without changing its modification time
+    # (filesystem timestamps may be coarse), so only store the stamp of files that were not
+    # modified recently, recent files are hashed every time
+    if time.time_ns() - st.st_mtime_ns > _RACY_MTIME_NS:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = meta_file.with_name(f"{meta_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(f"{stamp}\n{cache_file.name}\n")
+        tmp_file.replace(meta_file)
+    return cache_file
+
+
+def _load_cache_file(cache_file: Path) -> list[ParseResult]:
+    with cache_file.open("rb") as f:
+        # Wah wah! More unsafe data 🤪🤪
+        return pickle.load(f)  # noqa: S301
+
+
+def _parse_file(
+    file: Path, cache_file: Path | None = None, st: os.stat_result | None = None
+) -> list[ParseResult]:
+    """Parse all source items for a single file, and optionally write them to the cache"""
+    result = []
+    logger.info(f"Parsing {file}")
+    for item in get_all_source_items(file, st):
+        result.extend(parse_item(item))
+
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, so an interrupted write never leaves a truncated
+        # cache file behind for later runs
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with tmp_file.open("wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+
+    return result
+
+
 def _parse_all_source_items_single(
     file: Path,
     cache_dir: Path | None = None,
@@ -118,33 +215,84 @@ def _parse_all_source_items_single(
 ) -> list[ParseResult]:
     """Parse all source items for a single file, and gather them in a list as to be able to
     pickle them for multiprocessing."""
+    if cache_dir is None or not use_cache:
+        return _parse_file(file)
+
+    # the file is only stat'ed once, for both the cache lookup and the empty file check
+    st = file.stat()
+    cache_file = _get_cache_file(file, cache_dir, st)
+    try:
+        # opening directly saves a separate existence check
+        result = _load_cache_file(cache_file)
+    except FileNotFoundError:
+        return _parse_file(file, cache_file, st)
+    logger.info(f"Using cached file for {file.name}")
+    return result
 
-    cache_file = None  # ok PyCharm, if this makes you happy
-    if cache_dir is not None and use_cache:
-        # hash source file
-        # we salt this with the version of blark that we are using, as it may affect the results
-        file_hash = hashlib.sha256(version("blark").encode())
-        with file.open("rb") as f:
-            file_hash.update(f.read())
 
-        cache_file = cache_dir / f"{file.name}.{file_hash.hexdigest()}.pkl"
+def _parse_all_source_items_batch(
+    files: list[Path],
+    cache_dir: Path | None = None,
+    use_cache: bool = True,
+) -> list[list[ParseResult] | Path]:
+    """Parse all source items for a batch of files. If caching is enabled, the results are not
+    returned, but only their cache file: the caller can load it directly, instead of the
+    results being pickled once more to send them back from the worker process."""
+    results = []
+    for file in files:
+        if cache_dir is None or not use_cache:
+            results.append(_parse_file(file))
+            continue
+
+        st = file.stat()
+        cache_file = _get_cache_file(file, cache_dir, st)
         if cache_file.exists():
             logger.info(f"Using cached file for {file.name}")
-            with cache_file.open("rb") as f:
-                # Wah wah! More unsafe data 🤪🤪
-                return pickle.load(f)  # noqa: S301
+        else:
+            _parse_file(file, cache_file, st)
+        results.append(cache_file)
+    return results
 
-    result = []
-    logger.info(f"Parsing {file}")
-    for item in get_all_source_items(file):
-        result.extend(parse_item(item))
 
-    if cache_dir is not None and use_cache:
-        cache_file.parent.mkdir(parents=True, exist_ok=True)
-        with cache_file.open("wb") as f:
-            pickle.dump(result, f)
+# maximum number of ProcessPoolExecutor workers on Windows
+_MAX_WINDOWS_WORKERS = 61
+
+
+def _available_cpu_count() -> int:
+    """Number of CPUs this process may run on, which respects CPU affinity (e.g. in containers),
+    unlike os.cpu_count()"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    n_cpus = os.cpu_count() or 1
+    if sys.platform == "win32":
+        # the ProcessPoolExecutor raises a ValueError for more workers (its default is capped)
+        n_cpus = min(n_cpus, _MAX_WINDOWS_WORKERS)
+    return n_cpus
 
-    return result
+
+# the process pool is kept alive between calls, as starting workers (and importing blark in
+# them) is expensive. It is only replaced if it is requested with other arguments.
+_POOL: tuple[fut.ProcessPoolExecutor, dict] | None = None
+
+
+def _get_pool(**kwargs) -> fut.ProcessPoolExecutor:
+    global _POOL  # noqa: PLW0603
+    if _POOL is not None and _POOL[1] != kwargs:
+        _POOL[0].shutdown()
+        _POOL = None
+    if _POOL is None:
+        _POOL = (fut.ProcessPoolExecutor(**kwargs), kwargs)
+    return _POOL[0]
+
+
+@atexit.register
+def shutdown_pool():
+    """Shut down the parse process pool. Its management threads keep running until then, so do
+    this before forking other processes (e.g. for parallel linting)."""
+    global _POOL  # noqa: PLW0603
+    if _POOL is not None:
+        _POOL[0].shutdown(cancel_futures=True)
+        _POOL = None
 
 
 def parse_all_source_items(
@@ -157,24 +305,38 @@ def parse_all_source_items(
     """Load and get all source items for this list of files, in parallel. kwargs are passed to
     the ProcessPoolExecutor, one may want to pass max_workers for example."""
     if parallel:
-        futures: dict[fut.Future[list], Path] = {}
-        with fut.ProcessPoolExecutor(**kwargs) as pool:
-            logger.info("Submitting files for parsing...")
-            for file in files:
-                futures[
-                    pool.submit(
-                        _parse_all_source_items_single,
-                        file,
-                        cache_dir=cache_dir,
-                        use_cache=use_cache,
-                    )
-                ] = file
-
-            logger.info(f"{len(futures)} files submitted for parsing")
-            for future in fut.as_completed(futures):
-                result = future.result()
-                logger.info(f"Parsed {futures[future].name}")
-                yield from result
+        files = list(files)
+        n_workers = kwargs.pop("max_workers", None) or _available_cpu_count()
+        pool = _get_pool(max_workers=n_workers, **kwargs)
+
+        # files are submitted in batches (about 4 per worker), as small files are often
+        # dominated by the overhead of submitting them and sending back the results
+        batch_size = max(1, len(files) // (4 * n_workers))
+
+        def _batch_results(
+            future: fut.Future[list], batch: list[Path]
+        ) -> Iterator[ParseResult]:
+            for file, result in zip(batch, future.result(), strict=True):
+                logger.info(f"Parsed {file.name}")
+                yield from _load_cache_file(result) if isinstance(result, Path) else result
+
+        # results are yielded in file order, with a bounded number of batches in flight, so
+        # results are consumed while other files are still being parsed
+        logger.info(f"Parsing {len(files)} files in batches of {batch_size}...")
+        in_flight: deque[tuple[fut.Future[list], list[Path]]] = deque()
+        for i in range(0, len(files), batch_size):
+            batch = files[i : i + batch_size]
+            future = pool.submit(
+                _parse_all_source_items_batch,
+                batch,
+                cache_dir=cache_dir,
+                use_cache=use_cache,
+            )
+            in_flight.append((future, batch))
+            if len(in_flight) >= 2 * n_workers:
+                yield from _batch_results(*in_flight.popleft())
+        while in_flight:
+            yield from _batch_results(*in_flight.popleft())
     else:
         for file in files:
             yield from _parse_all_source_items_single(
@@ -0,0 +1,52 @@
+import importlib.util
+from collections.abc import Iterable
+from pathlib import Path
+
+from catscan.utils import log
+
+logger = log.get_logger()
+
+# module files of all loaded plugins, so lint worker processes can load the same plugins (and
+# forked workers, which inherit this, do not register their checks a second time)
+_LOADED_PLUGINS: list[Path] = []
+
+
+def _import_module_from_path(path: Path):
+    path = path.resolve()
+    if path in _LOADED_PLUGINS:
+        return
+    logger.info(f"Loading plugin from {path}")
+    spec = importlib.util.spec_from_file_location(path.stem, str(path))
+    if spec and spec.loader:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _LOADED_PLUGINS.append(path)
+
+
+def _recursively_import(path: Path):
+    """Recursively import modules from a directory or file."""
+
+    if path.is_file() and path.suffix == ".py":
+        # Simple single-file python module
+        _import_module_from_path(path)
+    elif path.is_dir():
+        init_file = path / "__init__.py"
+        if init_file.exists():
+            # directory-based python module
+            _import_module_from_path(init_file)
+        else:
+            # load modules recursively
+            for sub_path in path.iterdir():
+                _recursively_import(sub_path)
+
+
+def load_plugins(plugins: Iterable[Path]):
+    """Load catscan plugins from paths. This is done by simply importing the module. The
+    @lint_check decorator should then automatically register new plugins."""
+    for plugin in plugins:
+        _recursively_import(plugin)
+
+
+def loaded_plugins() -> tuple[Path, ...]:
+    """Get the module files of all plugins loaded so far"""
+    return tuple(_LOADED_PLUGINS)
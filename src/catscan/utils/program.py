@@ -1,7 +1,9 @@
 import dataclasses
 import html
-from collections.abc import Callable, Iterator
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
 from functools import partial
+from typing import Any, get_args
 
 import blark.transform as tf
 from blark.summary import (
@@ -9,12 +11,13 @@ from blark.summary import (
     PropertyGetSetSummary,
 )
 
-from .tc3 import streq
+from .tc3 import is_super, is_super_call
 
 _Graphable = MethodSummary | PropertyGetSetSummary | tf.StatementList
 
 
-@dataclasses.dataclass
+# nodes are compared (and hashed) by identity, many of them are created for every program graph
+@dataclasses.dataclass(slots=True, eq=False)
 class ProgramNode:
     label: str | None = None
 
@@ -24,9 +27,6 @@ class ProgramNode:
     next: set["ProgramNode"] = dataclasses.field(default_factory=set)
     statements: list[tf.Statement] = dataclasses.field(default_factory=list)
 
-    def __hash__(self):
-        return hash(id(self))
-
     def add_next(self, node: "ProgramNode | None" = None, **kwargs):
         if node is None:
             node = ProgramNode(**kwargs)
@@ -42,11 +42,31 @@ class ProgramNode:
         return node
 
 
+# (obj, start, end, exit_destination, continue_destination) and (start, end) of a (partial)
+# program graph, see _get_program_graph
+_GraphArgs = tuple[
+    _Graphable | tf.Statement | None,
+    ProgramNode | None,
+    ProgramNode | None,
+    ProgramNode | None,
+    ProgramNode | None,
+]
+_GraphResult = tuple[ProgramNode, ProgramNode | None]
+
+
+# program graphs by id of the object, with the object itself to keep it alive, as the same
+# graph is queried by many checks. Graphs are not modified once they have been built.
+_GRAPH_CACHE: dict[int, tuple[Any, ProgramNode]] = {}
+
+
 def get_program_graph(
     obj: _Graphable,
 ) -> ProgramNode:
     assert obj is not None
-    return _get_program_graph(obj)[0]
+    cached = _GRAPH_CACHE.get(id(obj))
+    if cached is None:
+        cached = _GRAPH_CACHE[id(obj)] = (obj, _get_program_graph(obj)[0])
+    return cached[1]
 
 
 def _get_program_graph(
@@ -64,6 +84,30 @@ def _get_program_graph(
     returned start to the returned end, for example in case all code paths in a switch or an
     if/else chain return or exit)."""
 
+    # the graph is built without recursion: builders are generators, which yield the arguments
+    # for the graph of a nested statement, and are sent back the resulting (start, end) pair
+    builders = [_build_program_graph(obj, start, end, exit_destination, continue_destination)]
+    result = None
+    while builders:
+        try:
+            nested = builders[-1].send(result)
+        except StopIteration as stop:
+            builders.pop()
+            result = stop.value
+        else:
+            builders.append(_build_program_graph(*nested))
+            result = None
+    return result
+
+
+def _build_program_graph(
+    obj: _Graphable | tf.Statement | None,
+    start: ProgramNode | None,
+    end: ProgramNode | None,
+    exit_destination: ProgramNode | None,
+    continue_destination: ProgramNode | None,
+) -> Generator[_GraphArgs, _GraphResult, _GraphResult]:
+    """Build the program graph for _get_program_graph, see there"""
     if obj is None:
         return start, end
     if end is None:
@@ -76,160 +120,280 @@ def _get_program_graph(
             # (<Node>, None), so this code is unreachable
             return start, end
 
-    if isinstance(obj, MethodSummary | PropertyGetSetSummary):
-        # it makes no sense to start a program graph for a method with an existing source node
-        assert start is end and not start.statements
-        assert continue_destination is None and exit_destination is None
-        start.label = f"method {obj.name}"
-        impl = obj.implementation
-        if impl is not None and impl.statements is not None:
-            for stat in impl.statements:
-                # progressively append to the head
-                _, end = _get_program_graph(stat, start=start, end=end)
-                if end is None:
-                    # i.e. unreachable code
-                    break
-
-        # if no statements occur in the program, just return an empty program
-        return start, end
-    elif isinstance(obj, tf.StatementList):
-        for stat in obj.statements:
+    handler = _get_graph_handler(type(obj))
+    result = handler(obj, start, end, exit_destination, continue_destination)
+    if isinstance(result, Generator):
+        # compound statement, which builds the graphs of its nested statements
+        result = yield from result
+    return result
+
+
+def _graph_method(
+    obj: MethodSummary | PropertyGetSetSummary,
+    start: ProgramNode,
+    end: ProgramNode,
+    exit_destination: ProgramNode | None,
+    continue_destination: ProgramNode | None,
+) -> Generator[_GraphArgs, _GraphResult, _GraphResult]:
+    # it makes no sense to start a program graph for a method with an existing source node
+    assert start is end and not start.statements
+    assert continue_destination is None and exit_destination is None
+    start.label = f"method {obj.name}"
+    impl = obj.implementation
+    if impl is not None and impl.statements is not None:
+        for stat in impl.statements:
+            if type(stat) in _LEAF_STATEMENT_TYPES:
+                # fast path for the most common statements, see _graph_leaf
+                end.statements.append(stat)
+                continue
             # progressively append to the head
-            _, end = _get_program_graph(
-                stat,
-                start=start,
-                end=end,
-                continue_destination=continue_destination,
-                exit_destination=exit_destination,
-            )
-        return start, end
+            _, end = yield (stat, start, end, None, None)
+            if end is None:
+                # i.e. unreachable code
+                break
+
+    # if no statements occur in the program, just return an empty program
+    return start, end
+
+
+def _graph_statement_list(
+    obj: tf.StatementList,
+    start: ProgramNode,
+    end: ProgramNode,
+    exit_destination: ProgramNode | None,
+    continue_destination: ProgramNode | None,
+) -> Generator[_GraphArgs, _GraphResult, _GraphResult]:
+    for stat in obj.statements:
+        if end is not None and type(stat) in _LEAF_STATEMENT_TYPES:
+            # fast path for the most common statements, see _graph_leaf
+            end.statements.append(stat)
+            continue
+        # progressively append to the head
+        _, end = yield (stat, start, end, exit_destination, continue_destination)
+    return start, end
+
+
+def _graph_if(
+    obj: tf.IfStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    exit_destination: ProgramNode | None,
+    continue_destination: ProgramNode | None,
+) -> Generator[_GraphArgs, _GraphResult, _GraphResult]:
+    if_end = ProgramNode(label="if_end")
+    _, _end = yield (
+        obj.statements,
+        start,
+        end.add_next(stat=obj, label=f"if {obj.if_expression}"),
+        exit_destination,
+        continue_destination,
+    )
+    if _end is not None:
+        _end.add_next(if_end)
+
+    for elsif in obj.else_ifs:
+        _, _end = yield (
+            elsif.statements,
+            start,
+            end.add_next(label=f"elsif {elsif.if_expression}"),
+            exit_destination,
+            continue_destination,
+        )
+        if _end is not None:
+            _end.add_next(if_end)
+
+    if obj.else_clause is not None:
+        _, _end = yield (
+            obj.else_clause.statements,
+            start,
+            end.add_next(label="else"),
+            exit_destination,
+            continue_destination,
+        )
+        if _end is not None:
+            _end.add_next(if_end)
     else:
-        # a more explicit check about the statements we expect is in the final 'else' clause
-        # of course, this may be a bit excessive, but it just ensures that there is no mismatch
-        # between blark statements and the things we know of
-        assert isinstance(obj, tf.Statement), f"Expected statement, got {type(obj)} ({obj})"
-        if isinstance(obj, tf.IfStatement):
-            if_end = ProgramNode(label="if_end")
-            _, _end = _get_program_graph(
-                obj.statements,
-                start=start,
-                end=end.add_next(stat=obj, label=f"if {obj.if_expression}"),
-                continue_destination=continue_destination,
-                exit_destination=exit_destination,
-            )
-            if _end is not None:
-                _end.add_next(if_end)
-
-            for elsif in obj.else_ifs:
-                _, _end = _get_program_graph(
-                    elsif.statements,
-                    start=start,
-                    end=end.add_next(label=f"elsif {elsif.if_expression}"),
-                    continue_destination=continue_destination,
-                    exit_destination=exit_destination,
-                )
-                if _end is not None:
-                    _end.add_next(if_end)
-
-            if obj.else_clause is not None:
-                _, _end = _get_program_graph(
-                    obj.else_clause.statements,
-                    start=start,
-                    end=end.add_next(label="else"),
-                    continue_destination=continue_destination,
-                    exit_destination=exit_destination,
-                )
-                if _end is not None:
-                    _end.add_next(if_end)
-            else:
-                # no else clause means an implicit empty else clause
-                end.add_next(label="_else").add_next(if_end)
-                pass
-            return start, if_end
-        elif isinstance(obj, tf.CaseStatement):
-            case_node = end.add_next(stat=obj, label=f"CASE {obj.expression}")
-            case_end = ProgramNode(label="case_end")
-
-            for case in obj.cases:
-                _, _end = _get_program_graph(
-                    case.statements,
-                    start=start,
-                    end=case_node.add_next(stat=obj, label=str(case.matches)),
-                    continue_destination=continue_destination,
-                    exit_destination=exit_destination,
-                )
-                if _end is not None:
-                    _end.add_next(case_end)
-            if obj.else_clause is not None:
-                _, _end = _get_program_graph(
-                    obj.else_clause.statements,
-                    start=start,
-                    end=case_node.add_next(label="else"),
-                    continue_destination=continue_destination,
-                    exit_destination=exit_destination,
-                )
-                if _end is not None:
-                    _end.add_next(case_end)
-
-            # if all cases end in a return statement, the constructed graph will just be
-            # disconnected, which is okay, as outside of the function we only use 'start'
-            # anyway
-            return start, case_end
-        elif isinstance(obj, tf.WhileStatement | tf.RepeatStatement | tf.ForStatement):
-            loop = end.add_next(stat=obj, label="loop")
-            loop_start = loop.add_next(label="loop_start")
-            loop_end = ProgramNode(label="loop_end")
-
-            _, _end = _get_program_graph(
-                obj.statements,
-                start=start,
-                end=loop_start,
-                continue_destination=loop_start,
-                exit_destination=loop_end,
-            )
-            if _end is not None:
-                _end.add_next(loop_end)
-
-            # condition false, add empty node
-            loop.add_next(label="_else").add_next(loop_end)
-            return start, loop_end
-        elif isinstance(obj, tf.LabeledStatement):
-            end = end.add_next(stat=obj, label=str(obj.label))
-            if obj.statement is not None:
-                end.statements.append(obj.statement)
-            return start, end
-        elif isinstance(obj, tf.ExitStatement):
-            if exit_destination is None:
-                msg = "EXIT used outside of loop"
-                raise ValueError(msg)
-            end.statements.append(obj)
-            end.add_next(exit_destination)
-            return start, None  # unreachable code after
-        elif isinstance(obj, tf.ContinueStatement):
-            if continue_destination is None:
-                msg = "CONTINUE used outside of loop"
-                raise ValueError(msg)
-            end.statements.append(obj)
-            end.add_next(continue_destination)
-            return start, None  # unreachable code after
-        elif isinstance(obj, tf.ReturnStatement):
-            end.statements.append(obj)
-            return start, None  # unreachable code after
-        elif isinstance(obj, tf.JumpStatement):
-            raise NotImplementedError
-        else:
-            leaf_stat = (
-                tf.ChainedFunctionCallStatement
-                | tf.NoOpStatement
-                | tf.SetStatement
-                | tf.ReferenceAssignmentStatement
-                | tf.ResetStatement
-                | tf.AssignmentStatement
-                | tf.FunctionCallStatement
-            )
-            assert isinstance(obj, leaf_stat)
-            end.statements.append(obj)
-            return start, end
+        # no else clause means an implicit empty else clause
+        end.add_next(label="_else").add_next(if_end)
+    return start, if_end
+
+
+def _graph_case(
+    obj: tf.CaseStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    exit_destination: ProgramNode | None,
+    continue_destination: ProgramNode | None,
+) -> Generator[_GraphArgs, _GraphResult, _GraphResult]:
+    case_node = end.add_next(stat=obj, label=f"CASE {obj.expression}")
+    case_end = ProgramNode(label="case_end")
+
+    for case in obj.cases:
+        _, _end = yield (
+            case.statements,
+            start,
+            case_node.add_next(stat=obj, label=str(case.matches)),
+            exit_destination,
+            continue_destination,
+        )
+        if _end is not None:
+            _end.add_next(case_end)
+    if obj.else_clause is not None:
+        _, _end = yield (
+            obj.else_clause.statements,
+            start,
+            case_node.add_next(label="else"),
+            exit_destination,
+            continue_destination,
+        )
+        if _end is not None:
+            _end.add_next(case_end)
+
+    # if all cases end in a return statement, the constructed graph will just be
+    # disconnected, which is okay, as outside of the function we only use 'start'
+    # anyway
+    return start, case_end
+
+
+def _graph_loop(
+    obj: tf.WhileStatement | tf.RepeatStatement | tf.ForStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    *_: ProgramNode | None,
+) -> Generator[_GraphArgs, _GraphResult, _GraphResult]:
+    loop = end.add_next(stat=obj, label="loop")
+    loop_start = loop.add_next(label="loop_start")
+    loop_end = ProgramNode(label="loop_end")
+
+    # EXIT jumps to the end of the loop, CONTINUE to its start
+    _, _end = yield (obj.statements, start, loop_start, loop_end, loop_start)
+    if _end is not None:
+        _end.add_next(loop_end)
+
+    # condition false, add empty node
+    loop.add_next(label="_else").add_next(loop_end)
+    return start, loop_end
+
+
+def _graph_labeled(
+    obj: tf.LabeledStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    *_: ProgramNode | None,
+) -> _GraphResult:
+    end = end.add_next(stat=obj, label=str(obj.label))
+    if obj.statement is not None:
+        end.statements.append(obj.statement)
+    return start, end
+
+
+def _graph_exit(
+    obj: tf.ExitStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    exit_destination: ProgramNode | None,
+    _continue_destination: ProgramNode | None,
+) -> _GraphResult:
+    if exit_destination is None:
+        msg = "EXIT used outside of loop"
+        raise ValueError(msg)
+    end.statements.append(obj)
+    end.add_next(exit_destination)
+    return start, None  # unreachable code after
+
+
+def _graph_continue(
+    obj: tf.ContinueStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    _exit_destination: ProgramNode | None,
+    continue_destination: ProgramNode | None,
+) -> _GraphResult:
+    if continue_destination is None:
+        msg = "CONTINUE used outside of loop"
+        raise ValueError(msg)
+    end.statements.append(obj)
+    end.add_next(continue_destination)
+    return start, None  # unreachable code after
+
+
+def _graph_return(
+    obj: tf.ReturnStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    *_: ProgramNode | None,
+) -> _GraphResult:
+    end.statements.append(obj)
+    return start, None  # unreachable code after
+
+
+def _graph_jump(
+    obj: tf.JumpStatement,
+    start: ProgramNode,
+    end: ProgramNode,
+    *_: ProgramNode | None,
+) -> _GraphResult:
+    raise NotImplementedError
+
+
+# statements without nested statements, which do not affect the control flow
+_LEAF_STATEMENT = (
+    tf.ChainedFunctionCallStatement
+    | tf.NoOpStatement
+    | tf.SetStatement
+    | tf.ReferenceAssignmentStatement
+    | tf.ResetStatement
+    | tf.AssignmentStatement
+    | tf.FunctionCallStatement
+)
+_LEAF_STATEMENT_TYPES = frozenset(get_args(_LEAF_STATEMENT))
+
+
+def _graph_leaf(
+    obj: tf.Statement,
+    start: ProgramNode,
+    end: ProgramNode,
+    *_: ProgramNode | None,
+) -> _GraphResult:
+    # a more explicit check about the statements we expect is done here
+    # of course, this may be a bit excessive, but it just ensures that there is no mismatch
+    # between blark statements and the things we know of
+    assert isinstance(obj, tf.Statement), f"Expected statement, got {type(obj)} ({obj})"
+    assert isinstance(obj, _LEAF_STATEMENT)
+    end.statements.append(obj)
+    return start, end
+
+
+_GraphHandler = Callable[
+    ...,
+    _GraphResult | Generator[_GraphArgs, _GraphResult, _GraphResult],
+]
+
+# graph handlers by (base) type, in order of precedence. Anything else is a leaf statement.
+_GRAPH_HANDLERS: tuple[tuple[type, _GraphHandler], ...] = (
+    (MethodSummary | PropertyGetSetSummary, _graph_method),
+    (tf.StatementList, _graph_statement_list),
+    (tf.IfStatement, _graph_if),
+    (tf.CaseStatement, _graph_case),
+    (tf.WhileStatement | tf.RepeatStatement | tf.ForStatement, _graph_loop),
+    (tf.LabeledStatement, _graph_labeled),
+    (tf.ExitStatement, _graph_exit),
+    (tf.ContinueStatement, _graph_continue),
+    (tf.ReturnStatement, _graph_return),
+    (tf.JumpStatement, _graph_jump),
+)
+# graph handler by concrete type, resolved from _GRAPH_HANDLERS on first use
+_GRAPH_HANDLER_CACHE: dict[type, _GraphHandler] = {}
+
+
+def _get_graph_handler(typ: type) -> _GraphHandler:
+    handler = _GRAPH_HANDLER_CACHE.get(typ)
+    if handler is None:
+        handler = _GRAPH_HANDLER_CACHE[typ] = next(
+            (handler for base, handler in _GRAPH_HANDLERS if issubclass(typ, base)),
+            _graph_leaf,
+        )
+    return handler
 
 
 def program_to_dot(start_node: ProgramNode | _Graphable) -> str:
@@ -248,9 +412,12 @@ def program_to_dot(start_node: ProgramNode | _Graphable) -> str:
             node_ids[node] = f"n{len(node_ids)}"
         return node_ids[node]
 
-    def visit(node):
+    # depth-first, with an explicit stack
+    todo = [start_node]
+    while todo:
+        node = todo.pop()
         if node in visited:
-            return
+            continue
         visited.add(node)
 
         node_id = get_node_id(node)
@@ -264,9 +431,8 @@ def program_to_dot(start_node: ProgramNode | _Graphable) -> str:
         for child in node.next:
             child_id = get_node_id(child)
             dot.append(f"    {node_id} -> {child_id};")
-            visit(child)
-
-    visit(start_node)
+            if child not in visited:
+                todo.append(child)
     dot.append("}")
     return "\n".join(dot)
 
@@ -276,12 +442,11 @@ def _find_statement_node(
     target: tf.Statement,
 ) -> ProgramNode | None:
     """Find a statement node in the graph."""
-    todo: set[ProgramNode] = {graph}
-    visited: set[ProgramNode] = set()
+    todo: deque[ProgramNode] = deque([graph])
+    visited: set[ProgramNode] = {graph}
 
     while todo:
-        node = todo.pop()
-        visited.add(node)
+        node = todo.popleft()
         if node.stat is target:
             return node
         for stat in node.statements:
@@ -290,12 +455,24 @@ def _find_statement_node(
 
         for nxt in node.next:
             if nxt not in visited:
-                todo.add(nxt)
+                visited.add(nxt)
+                todo.append(nxt)
 
     # target node not found, may be unreachable
     return None
 
 
+def _get_path(
+    parents: dict[ProgramNode, ProgramNode | None], node: ProgramNode
+) -> list[ProgramNode]:
+    """Get the path from a node back to where the search started, from the parent nodes"""
+    path = []
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    return path
+
+
 def _predicate_on_all_code_paths(
     source: MethodSummary | PropertyGetSetSummary | tf.StatementList,
     pred: Callable[[tf.Statement], bool],
@@ -304,12 +481,12 @@ def _predicate_on_all_code_paths(
     statement exists on all paths, or an output variable is assigned on all code paths).
     Returns the failing code path (or None if there is no path that fails)."""
     graph = get_program_graph(source)
-    todo: dict[ProgramNode, list[ProgramNode]] = {graph: []}
-    visited: set[ProgramNode] = set()
+    # the node from which each node was reached, the failing path is only built if there is one
+    parents: dict[ProgramNode, ProgramNode | None] = {graph: None}
+    todo: list[ProgramNode] = [graph]
 
     while todo:
-        node, path = todo.popitem()
-        visited.add(node)
+        node = todo.pop()
         if node.stat is not None and pred(node.stat):
             continue
 
@@ -322,11 +499,12 @@ def _predicate_on_all_code_paths(
             # successors must satisfy the predicate everywhere along their code paths.
             # If the node has no successors, it is the last node, and some code path failed
             if not node.next:
-                return [*path, node]
+                return _get_path(parents, node)[::-1]
 
             for nxt in node.next:
-                if nxt not in visited:
-                    todo[nxt] = [*path, node]
+                if nxt not in parents:
+                    parents[nxt] = node
+                    todo.append(nxt)
     return None
 
 
@@ -345,8 +523,9 @@ def _predicate_on_all_code_paths_to(
     if tgt_node is None:
         return None
 
-    todo: dict[ProgramNode, list[ProgramNode]] = {tgt_node: []}
-    visited: set[ProgramNode] = set()
+    # the node from which each node was reached, the failing path is only built if there is one
+    parents: dict[ProgramNode, ProgramNode | None] = {tgt_node: None}
+    todo: list[ProgramNode] = [tgt_node]
 
     def _is_node_ok(_node: ProgramNode) -> bool:
         """Check whether the given node satisfies the predicate BEFORE the target statement"""
@@ -370,18 +549,18 @@ def _predicate_on_all_code_paths_to(
         return False
 
     while todo:
-        node, path = todo.popitem()
-        visited.add(node)
+        node = todo.pop()
         if not _is_node_ok(node):
             # Predicate does NOT hold anywhere on this graph node, this means that all of it's
             # successors must satisfy the predicate everywhere along their code paths.
             # If the node has no successors, it is the last node, and some code path failed
             if not node.prev:
-                return [node, *path]
+                return _get_path(parents, node)
 
             for prv in node.prev:
-                if prv not in visited:
-                    todo[prv] = [node, *path]
+                if prv not in parents:
+                    parents[prv] = node
+                    todo.append(prv)
     return None
 
 
@@ -390,24 +569,114 @@ def get_statements(
 ) -> Iterator[tf.Statement]:
     """Iterate through all (nested) statements of a method, statement list or of a single
     (possibly again nested) statement"""
+    if not isinstance(obj, MethodSummary | PropertyGetSetSummary):
+        # statement lists and statements are not (re)used for code path checks, so their
+        # program graphs are not built just to get the statements
+        yield from _get_reachable_statements(obj)
+        return
 
-    # Even though it may be slightly less efficient, we get the statements from the program
-    # graph, which makes it so we do not have to keep this method and get_program_graph in
-    # sync
+    # Even though it may be slightly less efficient, we get the statements of methods from the
+    # program graph, which makes it so we do not have to keep this method and get_program_graph
+    # in sync. The graph is needed for code path checks on methods anyway.
     graph = get_program_graph(obj)
-    visited: set[ProgramNode] = set()
-    todo: set[ProgramNode] = {graph}
+    # breadth-first, so statements are roughly in program order
+    todo: deque[ProgramNode] = deque([graph])
+    visited: set[ProgramNode] = {graph}
 
     while todo:
-        node = todo.pop()
-        visited.add(node)
+        node = todo.popleft()
         if node.stat is not None:
             yield node.stat
         yield from node.statements
 
         for nxt in node.next:
             if nxt not in visited:
-                todo.add(nxt)
+                visited.add(nxt)
+                todo.append(nxt)
+
+
+def _get_reachable_statements(
+    obj: tf.StatementList | tf.Statement,
+    in_loop: bool = False,
+) -> Generator[tf.Statement, None, bool]:
+    """Get the statements of a statement list or a single statement in program order, which
+    are the same statements as those that are reachable in its program graph, see
+    _get_program_graph. Returns whether the end of the statement(s) is reachable."""
+    if isinstance(obj, tf.StatementList):
+        for stat in obj.statements:
+            if not (yield from _get_reachable_statements(stat, in_loop)):
+                # the remaining statements are unreachable
+                return False
+        return True
+
+    assert isinstance(obj, tf.Statement), f"Expected statement, got {type(obj)} ({obj})"
+    if isinstance(obj, tf.IfStatement):
+        yield obj
+        reachable = yield from _get_reachable_statements(obj.statements, in_loop)
+        for elsif in obj.else_ifs:
+            reachable = (
+                yield from _get_reachable_statements(elsif.statements, in_loop)
+            ) or reachable
+        if obj.else_clause is None:
+            # implicit empty else clause
+            return True
+        return (
+            yield from _get_reachable_statements(obj.else_clause.statements, in_loop)
+        ) or reachable
+    elif isinstance(obj, tf.CaseStatement):
+        # the case statement is part of the node of the CASE itself, and of those of each case
+        reachable = False
+        yield obj
+        for case in obj.cases:
+            yield obj
+            reachable = (
+                yield from _get_reachable_statements(case.statements, in_loop)
+            ) or reachable
+        if obj.else_clause is not None:
+            reachable = (
+                yield from _get_reachable_statements(obj.else_clause.statements, in_loop)
+            ) or reachable
+        return reachable
+    elif isinstance(obj, tf.WhileStatement | tf.RepeatStatement | tf.ForStatement):
+        yield obj
+        yield from _get_reachable_statements(obj.statements, in_loop=True)
+        return True
+    elif isinstance(obj, tf.LabeledStatement):
+        yield obj
+        if obj.statement is not None:
+            yield obj.statement
+        return True
+    elif isinstance(obj, tf.ExitStatement | tf.ContinueStatement):
+        if not in_loop:
+            keyword = "EXIT" if isinstance(obj, tf.ExitStatement) else "CONTINUE"
+            msg = f"{keyword} used outside of loop"
+            raise ValueError(msg)
+        yield obj
+        return False
+    elif isinstance(obj, tf.ReturnStatement):
+        yield obj
+        return False
+    elif isinstance(obj, tf.JumpStatement):
+        raise NotImplementedError
+
+    assert isinstance(obj, _LEAF_STATEMENT)
+    yield obj
+    return True
+
+
+# dataclass field names by type, None if the type is not a dataclass
+_FIELD_NAMES: dict[type, tuple[str, ...] | None] = {}
+
+
+def _get_field_names(typ: type) -> tuple[str, ...] | None:
+    try:
+        return _FIELD_NAMES[typ]
+    except KeyError:
+        names = None
+        if dataclasses.is_dataclass(typ):
+            names = tuple(field.name for field in dataclasses.fields(typ))
+        _FIELD_NAMES[typ] = names
+        return names
 
 
 def _get_expressions(
@@ -425,38 +694,36 @@ def _get_expressions(
     yields expressions that way."""
     assert not outer or isinstance(obj, tf.Statement)
 
-    # don't yield expressions from substatements
-    if not outer and isinstance(obj, tf.Statement):
-        return
-    if not include_assigned_values:
-        if isinstance(obj, tf.AssignmentStatement):
-            yield obj.expression
-            return
-        elif isinstance(obj, tf.ReferenceAssignmentStatement):
-            yield obj.expression
-            return
-        elif isinstance(obj, tf.ForStatement):
-            yield obj.from_
-            yield obj.to
-            for stat in obj.statements.statements:
-                yield from _get_expressions(
-                    stat,
-                    include_assigned_values=include_assigned_values,
-                    outer=True,  # allow outer again because these will be statements
-                )
-            return
-    if isinstance(obj, tf.Expression):
-        yield obj
-    elif dataclasses.is_dataclass(obj):
-        # all blark transform objects are dataclasses
-        for field in dataclasses.fields(obj):
-            yield from _get_expressions(getattr(obj, field.name), outer=False)
-    elif isinstance(obj, dict):
-        for val in obj.values():
-            yield from _get_expressions(val, outer=False)
-    elif isinstance(obj, list | tuple):
-        for val in obj:
-            yield from _get_expressions(val, outer=False)
+    # explicit stack of (object, outer) pairs, children are pushed in reverse to keep the order
+    todo: list[tuple[Any, bool]] = [(obj, outer)]
+    while todo:
+        obj, outer = todo.pop()
+
+        # don't yield expressions from substatements
+        if not outer and isinstance(obj, tf.Statement):
+            continue
+        if not include_assigned_values:
+            if isinstance(obj, tf.AssignmentStatement):
+                yield obj.expression
+                continue
+            elif isinstance(obj, tf.ReferenceAssignmentStatement):
+                yield obj.expression
+                continue
+            elif isinstance(obj, tf.ForStatement):
+                yield obj.from_
+                yield obj.to
+                # allow outer again because these will be statements
+                todo.extend((stat, True) for stat in reversed(obj.statements.statements))
+                continue
+        if isinstance(obj, tf.Expression):
+            yield obj
+        elif (field_names := _get_field_names(type(obj))) is not None:
+            # all blark transform objects are dataclasses
+            todo.extend((getattr(obj, name), False) for name in reversed(field_names))
+        elif isinstance(obj, dict):
+            todo.extend((val, False) for val in reversed(obj.values()))
+        elif isinstance(obj, list | tuple):
+            todo.extend((val, False) for val in reversed(obj))
 
 
 def get_expressions(stat: tf.Statement, include_assigned_values: bool = False):
@@ -467,6 +734,103 @@ def get_expressions(stat: tf.Statement, include_assigned_values: bool = False):
     )
 
 
+def _get_child_expressions(
+    expr: tf.Expression,
+    include_assigned_values: bool = False,
+) -> list[tf.Expression]:
+    """Get the direct subexpressions of a given expression, in order."""
+    handler = _CHILD_EXPRESSION_HANDLER_CACHE.get(type(expr))
+    if handler is None:
+        handler = _get_child_expression_handler(type(expr))
+    return handler(expr, include_assigned_values)
+
+
+def _get_child_expression_handler(typ: type) -> Callable[[Any, bool], list[tf.Expression]]:
+    handler = _CHILD_EXPRESSION_HANDLER_CACHE[typ] = next(
+        (handler for base, handler in _CHILD_EXPRESSION_HANDLERS if issubclass(typ, base)),
+        _leaf_child_expressions,
+    )
+    return handler
+
+
+def _function_call_child_expressions(
+    expr: tf.FunctionCall, include_assigned_values: bool
+) -> list[tf.Expression]:
+    # We do not really want to yield the function name as a subexpression.
+    # We couldn't really do any meaningful checks on this anyway, except maybe
+    # capitalization. Existence would be checked in a build anyway, and the type can not
+    # easily be represented
+    # yield from get_subexpressions(expr.name)  # SymbolicVariable is an expression
+    children = []
+    for param in expr.parameters:
+        assert isinstance(
+            param,
+            tf.OutputParameterAssignment | tf.InputParameterAssignment,
+        )
+        if isinstance(param, tf.OutputParameterAssignment) and not include_assigned_values:
+            break
+        if param.value is not None:
+            children.append(param.value)
+    return children
+
+
+def _leaf_child_expressions(expr: tf.Expression, _: bool) -> list[tf.Expression]:
+    # let's just validate that the expression is of a "leaf type" (having no subexpressions)
+    # explicitly
+    leaf_type = (
+        tf.Literal
+        | tf.Integer
+        | tf.BinaryInteger
+        | tf.OctalInteger
+        | tf.HexInteger
+        | tf.Real
+        | tf.BitString
+        | tf.BinaryBitString
+        | tf.OctalBitString
+        | tf.HexBitString
+        | tf.Boolean
+        | tf.Duration
+        | tf.Lduration
+        | tf.TimeOfDay
+        | tf.LtimeOfDay
+        | tf.Date
+        | tf.Ldate
+        | tf.DateTime
+        | tf.LdateTime
+        | tf.String
+        | tf.DirectVariable
+        | tf.Location
+        | tf.SimpleVariable
+    )
+    assert isinstance(expr, leaf_type)
+    return []
+
+
+# direct subexpression getters by (base) type, in order of precedence. Anything else is a leaf
+# expression.
+_CHILD_EXPRESSION_HANDLERS: tuple[
+    tuple[type, Callable[[Any, bool], list[tf.Expression]]], ...
+] = (
+    (tf.UnaryOperation, lambda expr, _: [expr.expr]),
+    (tf.BinaryOperation, lambda expr, _: [expr.left, expr.right]),
+    (tf.ParenthesizedExpression, lambda expr, _: [expr.expr]),
+    (tf.BracketedExpression, lambda expr, _: [expr.expression]),
+    (tf.FunctionCall, _function_call_child_expressions),
+    (tf.ChainedFunctionCall, lambda expr, _: list(expr.invocations)),
+    (
+        tf.MultiElementVariable,
+        lambda expr, _: [
+            subs
+            for elt in expr.elements
+            if isinstance(elt, tf.SubscriptList)
+            for subs in elt.subscripts
+        ],
+    ),
+)
+# subexpression getter by concrete type, resolved from _CHILD_EXPRESSION_HANDLERS on first use
+_CHILD_EXPRESSION_HANDLER_CACHE: dict[type, Callable[[Any, bool], list[tf.Expression]]] = {}
+
+
 def get_subexpressions(
     expr: tf.Expression,
     exclude: Callable[[tf.Expression], bool] | None = None,
@@ -474,133 +838,183 @@ def get_subexpressions(
 ) -> Iterator[tf.Expression]:
     """Get all subexpressions of a given expression. Don't go any deeper if the expression is
     excluded by the provided predicate."""
+    return _walk_subexpressions((expr,), exclude, include_assigned_values)
 
-    if exclude is not None and exclude(expr):
-        return
 
-    yield expr
-
-    if isinstance(expr, tf.UnaryOperation):
-        yield from get_subexpressions(expr.expr)
-    elif isinstance(expr, tf.BinaryOperation):
-        yield from get_subexpressions(expr.left)
-        yield from get_subexpressions(expr.right)
-    elif isinstance(expr, tf.ParenthesizedExpression):
-        yield from get_subexpressions(expr.expr)
-    elif isinstance(expr, tf.BracketedExpression):
-        yield from get_subexpressions(expr.expression)
-    elif isinstance(expr, tf.FunctionCall):
-        # We do not really want to yield the function name as a subexpression.
-        # We couldn't really do any meaningful checks on this anyway, except maybe
-        # capitalization. Existence would be checked in a build anyway, and the type can not
-        # easily be represented
-        # yield from get_subexpressions(expr.name)  # SymbolicVariable is an expression
-        for param in expr.parameters:
-            assert isinstance(
-                param,
-                tf.OutputParameterAssignment | tf.InputParameterAssignment,
+def get_statement_subexpressions(
+    stat: tf.Statement,
+    exclude: Callable[[tf.Expression], bool] | None = None,
+    include_assigned_values: bool = False,
+) -> Iterator[tf.Expression]:
+    """Get all expressions of a statement and their subexpressions, in the same order as
+    get_subexpressions for each of get_expressions."""
+    return _walk_subexpressions(get_expressions(stat), exclude, include_assigned_values)
+
+
+def _walk_subexpressions(
+    exprs: Iterable[tf.Expression],
+    exclude: Callable[[tf.Expression], bool] | None,
+    include_assigned_values: bool,
+) -> Iterator[tf.Expression]:
+    """Walk the expressions and their subexpressions, depth-first. Like the recursive
+    get_subexpressions used to, the predicate and include_assigned_values only apply to the
+    given expressions, not to their subexpressions."""
+    handlers = _CHILD_EXPRESSION_HANDLER_CACHE
+    for expr in exprs:
+        if exclude is not None and exclude(expr):
+            continue
+
+        yield expr
+        handler = handlers.get(type(expr)) or _get_child_expression_handler(type(expr))
+        children = handler(expr, include_assigned_values)
+        if not children:
+            continue
+
+        # children are pushed in reverse to keep the (depth-first) order
+        todo = children[::-1]
+        while todo:
+            subexpr = todo.pop()
+            yield subexpr
+            # the handler lookup of _get_child_expressions, inlined as this runs for every node
+            handler = handlers.get(type(subexpr)) or _get_child_expression_handler(
+                type(subexpr)
             )
-            if isinstance(param, tf.OutputParameterAssignment) and not include_assigned_values:
-                return
-            if param.value is not None:
-                yield from get_subexpressions(param.value)
-    elif isinstance(expr, tf.ChainedFunctionCall):
-        for call in expr.invocations:
-            yield from get_subexpressions(call)
-    elif isinstance(expr, tf.MultiElementVariable):
-        for elt in expr.elements:
-            if isinstance(elt, tf.SubscriptList):
-                for subs in elt.subscripts:
-                    yield from get_subexpressions(subs)
-    else:
-        # let's just validate that the expression is of a "leaf type" (having no subexpressions)
-        # explicitly
-        leaf_type = (
-            tf.Literal
-            | tf.Integer
-            | tf.BinaryInteger
-            | tf.OctalInteger
-            | tf.HexInteger
-            | tf.Real
-            | tf.BitString
-            | tf.BinaryBitString
-            | tf.OctalBitString
-            | tf.HexBitString
-            | tf.Boolean
-            | tf.Duration
-            | tf.Lduration
-            | tf.TimeOfDay
-            | tf.LtimeOfDay
-            | tf.Date
-            | tf.Ldate
-            | tf.DateTime
-            | tf.LdateTime
-            | tf.String
-            | tf.DirectVariable
-            | tf.Location
-            | tf.SimpleVariable
-        )
-        assert isinstance(expr, leaf_type)
+            if children := handler(subexpr, False):
+                todo.extend(reversed(children))
 
 
 def all_subexpressions(obj: _Graphable, **kwargs) -> Iterator[tf.Expression]:
     for stat in get_statements(obj):
-        for expr in get_expressions(stat):
-            yield from get_subexpressions(expr, **kwargs)
+        # walks the expressions of the statement and their subexpressions with a single stack
+        yield from get_statement_subexpressions(stat, **kwargs)
+
+
+# Flattened traversals, keyed on the identity of the traversed object. The object itself is
+# stored as well, so it is kept alive (and its id cannot be reused) while it is cached.
+_TRAVERSAL_CACHE: dict[tuple[str, int], tuple[Any, list]] = {}
+
+
+# is_assignment_for results by (statement id, lower-case variable name), with the statement
+_ASSIGNMENT_CACHE: dict[tuple[int, str], tuple[tf.Statement, bool]] = {}
+
+
+def clear_traversal_cache():
+    """Clear all cached traversals and program graphs, should be done before linting (new)
+    code"""
+    _TRAVERSAL_CACHE.clear()
+    _ASSIGNMENT_CACHE.clear()
+    _GRAPH_CACHE.clear()
+
+
+def _cached_traversal(
+    kind: str, obj: _Graphable | tf.Statement, walk: Callable[[Any], Iterator]
+) -> list:
+    key = (kind, id(obj))
+    cached = _TRAVERSAL_CACHE.get(key)
+    if cached is None:
+        cached = _TRAVERSAL_CACHE[key] = (obj, list(walk(obj)))
+    return cached[1]
+
+
+def cached_statements(obj: _Graphable) -> list[tf.Statement]:
+    """Get all statements of an object like get_statements, but only walk the object once"""
+    return _cached_traversal("statements", obj, get_statements)
+
+
+def cached_subexpressions(obj: _Graphable) -> list[tf.Expression]:
+    """Get all subexpressions of an object like all_subexpressions, but only walk the object
+    once"""
+    return _cached_traversal("subexpressions", obj, all_subexpressions)
+
+
+def find_super_call(obj: _Graphable, meth_name: str | None = None) -> bool:
+    """Check whether an object contains a SUPER^() call, or a SUPER^.<meth_name>() call if a
+    method name is given. Stops walking at the first match."""
+    for stat in cached_statements(obj):
+        for expr in get_statement_subexpressions(stat):
+            if meth_name is not None:
+                if is_super_call(expr, meth_name):
+                    return True
+            elif (
+                isinstance(expr, tf.FunctionCall)
+                and isinstance(expr.name, tf.SimpleVariable)
+                and is_super(expr.name.name)
+            ):
+                return True
+    return False
+
+
+def _get_function_calls(stat: tf.Statement) -> Iterator[tf.FunctionCall]:
+    for expr in get_statement_subexpressions(stat):
+        if isinstance(expr, tf.FunctionCall):
+            yield expr
 
 
 def is_assignment_for(varname: str, stat: tf.Statement, adr_is_assignment: bool = True) -> bool:
     """Check whether a statement is an assignment for the given variable name. Treat any
     ADR(varname) statement as if it is being used to assign, as parsing pointer magic is hard,
     whenever adr_is_assignment is set to True (default)."""
+    return _is_assignment_for(str(varname).lower(), stat, adr_is_assignment)
+
+
+def _is_assignment_for(
+    lower_varname: str, stat: tf.Statement, adr_is_assignment: bool = True
+) -> bool:
+    """is_assignment_for, with an already lower-cased variable name, as it is called for many
+    statements with the same variable name"""
     is_assignment = False
     if isinstance(stat, tf.AssignmentStatement):
         is_assignment = any(
             (
-                (isinstance(var, tf.SimpleVariable) and streq(var.name, varname))
+                (isinstance(var, tf.SimpleVariable) and var.name.lower() == lower_varname)
                 # struct field assignments count as assignments
-                or (isinstance(var, tf.MultiElementVariable) and streq(var.name.name, varname))
+                or (
+                    isinstance(var, tf.MultiElementVariable)
+                    and var.name.name.lower() == lower_varname
+                )
             )
             for var in stat.variables
         )
     elif isinstance(stat, tf.ReferenceAssignmentStatement):
+        var = stat.variable
         is_assignment = (
-            isinstance(stat.variable, tf.SimpleVariable) and streq(stat.variable.name, varname)
+            isinstance(var, tf.SimpleVariable) and var.name.lower() == lower_varname
         ) or (
             # struct field assignments count as assignments
-            isinstance(stat.variable, tf.MultiElementVariable)
-            and streq(stat.variable.name.name, varname)
+            isinstance(var, tf.MultiElementVariable)
+            and var.name.name.lower() == lower_varname
         )
     elif isinstance(stat, tf.ForStatement):
-        is_assignment = isinstance(stat.control, tf.SimpleVariable) and streq(
-            stat.control.name, varname
+        is_assignment = (
+            isinstance(stat.control, tf.SimpleVariable)
+            and stat.control.name.lower() == lower_varname
         )
 
     if is_assignment:
         return True
 
-    for expr in get_expressions(stat):
-        for subexpr in get_subexpressions(expr):
-            if isinstance(subexpr, tf.FunctionCall):
-                # pointer magic is hard to parse, so by default we treat ADR(...) as if some
-                # assignment (i.e. a memcpy to this value) is about to happen
-                if adr_is_assignment:
-                    is_adr = (
-                        isinstance(subexpr.name, tf.SimpleVariable)
-                        and streq(subexpr.name.name, "ADR")
-                        and streq(subexpr.parameters[0].value.name, varname)  # type: ignore
-                    )
-                    if is_adr:
-                        return True
-
-                is_assignment = any(
-                    isinstance(param, tf.OutputParameterAssignment)
-                    and isinstance(param.value, tf.SimpleVariable)
-                    and streq(param.value.name, varname)
-                    for param in subexpr.parameters
-                )
-                if is_assignment:
-                    return True
+    # only function calls can assign to the variable from here, these are found once per
+    # statement, as the statement is checked for every variable
+    for subexpr in _cached_traversal("function_calls", stat, _get_function_calls):
+        # pointer magic is hard to parse, so by default we treat ADR(...) as if some
+        # assignment (i.e. a memcpy to this value) is about to happen
+        if adr_is_assignment:
+            is_adr = (
+                isinstance(subexpr.name, tf.SimpleVariable)
+                and subexpr.name.name.lower() == "adr"
+                and str(subexpr.parameters[0].value.name).lower() == lower_varname  # type: ignore
+            )
+            if is_adr:
+                return True
+
+        is_assignment = any(
+            isinstance(param, tf.OutputParameterAssignment)
+            and isinstance(param.value, tf.SimpleVariable)
+            and param.value.name.lower() == lower_varname
+            for param in subexpr.parameters
+        )
+        if is_assignment:
+            return True
     return False
 
 
@@ -609,7 +1023,9 @@ def has_assignment(
     varname: str,
 ) -> bool:
     """Check whether a given object (method or property getter) has a return value"""
-    failing_path = _predicate_on_all_code_paths(obj, partial(is_assignment_for, varname))
+    failing_path = _predicate_on_all_code_paths(
+        obj, partial(_is_assignment_for, str(varname).lower())
+    )
     return failing_path is None
 
 
@@ -619,7 +1035,15 @@ def has_assignment_before(
     varname: str,
 ) -> bool:
     """Check whether a given variable is assigned to before the given statement"""
-    failing_path = _predicate_on_all_code_paths_to(
-        meth, stat, partial(is_assignment_for, varname)
-    )
+    lower_varname = str(varname).lower()
+
+    def _is_assignment(_stat: tf.Statement) -> bool:
+        # the same statements are visited for every read of a variable, so cache the results
+        key = (id(_stat), lower_varname)
+        cached = _ASSIGNMENT_CACHE.get(key)
+        if cached is None:
+            cached = _ASSIGNMENT_CACHE[key] = (_stat, _is_assignment_for(lower_varname, _stat))
+        return cached[1]
+
+    failing_path = _predicate_on_all_code_paths_to(meth, stat, _is_assignment)
     return failing_path is None
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import Any, TypeVar
 
 import blark.transform as tf
@@ -10,6 +11,7 @@ logger = log.get_logger()
 
 _T = TypeVar("_T")
 
+
 # https://infosys.beckhoff.com/english.php?content=../content/1033/tf5100_tc3_nc_i/4188351883.html&id=
 # NOTE: there are ORDERED by size, which is important for finding the common types of two
 # different arithmetic types
@@ -27,6 +29,8 @@ BUILTIN_UNSIGNED_INTEGERS = (
     "UDINT",
     "ULINT",
 )
+# unordered, for fast membership checks
+BUILTIN_UNSIGNED_INTEGER_SET = frozenset(BUILTIN_UNSIGNED_INTEGERS)
 
 BUILTIN_SIGNED_INTEGERS = (
     "SINT",
@@ -83,6 +87,25 @@ BUILTIN_FUNCTIONS = {
 }
 
 
+# rank of arithmetic types for common_arithmetic_type: first by dominance of the type
+# set, then by size within the set (types are ordered by size)
+_ARITHMETIC_RANKS: dict[str, tuple[int, int]] = {
+    typ: (dominance, size)
+    for dominance, typset in enumerate(
+        reversed(
+            (
+                BUILTIN_TIME_RELATED,
+                BUILTIN_FLOATING_POINT,
+                BUILTIN_UNSIGNED_INTEGERS,
+                BUILTIN_SIGNED_INTEGERS,
+            )
+        ),
+        start=1,
+    )
+    for size, typ in enumerate(typset)
+}
+
+
 def common_arithmetic_type(typ1: str | None, typ2: str | None) -> str | None:
     """Determine common type for two arithmetic types as best we can. Either type may be
     unknown, in which case we just return the other."""
@@ -94,30 +117,29 @@ def common_arithmetic_type(typ1: str | None, typ2: str | None) -> str | None:
         # Oh, I know this one!
         return typ1
 
-    # dominance of types in order
-    dominant_types = [
-        BUILTIN_TIME_RELATED,
-        BUILTIN_FLOATING_POINT,
-        BUILTIN_UNSIGNED_INTEGERS,
-        BUILTIN_SIGNED_INTEGERS,
-    ]
-    for typset in dominant_types:
-        if typ1 in typset and typ2 not in typset:
-            return typ1
-        if typ2 in typset and typ1 not in typset:
-            return typ2
-        if typ1 in typset and typ2 in typset:
-            # higher index is larger type
-            return typset[max(typset.index(typ1), typset.index(typ2))]
+    rank1 = _ARITHMETIC_RANKS.get(typ1)
+    rank2 = _ARITHMETIC_RANKS.get(typ2)
+    if rank1 is not None or rank2 is not None:
+        return typ1 if (rank1 or (0, 0)) > (rank2 or (0, 0)) else typ2
 
     logger.warning(f"Failed to determine common type of arithmetic types {typ1} and {typ2}")
     # just return either as best guess?
     return typ1 or typ2
 
 
+@lru_cache(maxsize=65536)
+def _lower(s: str) -> str:
+    return s.lower()
+
+
 def streq(s1: str, s2: str) -> bool:
     """Non-strict string comparison"""
-    return str(s1).lower() == str(s2).lower()
+    if s1 == s2:
+        return True
+    # blark tokens are str already; anything else (e.g. variables) goes through str()
+    return _lower(s1 if isinstance(s1, str) else str(s1)) == _lower(
+        s2 if isinstance(s2, str) else str(s2)
+    )
 
 
 def is_super(var: str) -> bool:
@@ -179,26 +201,37 @@ def get_case_insensitive(
     return get_case_insensitive_with_fixed_key(dct, key, default=default)[1]
 
 
-ARRAY_TYPE_RE = re.compile(r"^ARRAY\s*\[([^]]*)]\s*OF\s+(.*)\s*$")
-REFERENCE_TYPE_RE = re.compile(r"^REFERENCE TO (.*)$")
+# TwinCAT keywords are case-insensitive
+ARRAY_TYPE_RE = re.compile(r"^ARRAY\s*\[([^]]*)]\s*OF\s+(.*)\s*$", re.IGNORECASE)
+REFERENCE_TYPE_RE = re.compile(r"^REFERENCE TO (.*)$", re.IGNORECASE)
+
+
+def match_array(typ: str) -> re.Match | None:
+    """Match an array type, the match can be passed to get_array_dims_and_base_type"""
+    return ARRAY_TYPE_RE.match(typ)
+
+
+def match_reference(typ: str) -> re.Match | None:
+    """Match a reference type, the match can be passed to get_reference_base_type"""
+    return REFERENCE_TYPE_RE.match(typ)
 
 
 def is_array(typ: str) -> bool:
-    return ARRAY_TYPE_RE.match(typ) is not None
+    return match_array(typ) is not None
 
 
-def get_array_dims_and_base_type(arr: str) -> tuple[int, str]:
-    match = ARRAY_TYPE_RE.match(arr)
+def get_array_dims_and_base_type(arr: str | re.Match) -> tuple[int, str]:
+    match = arr if isinstance(arr, re.Match) else match_array(arr)
     dims = match.group(1).count(",")
     return dims, match.group(2)
 
 
 def is_reference(typ: str) -> bool:
-    return REFERENCE_TYPE_RE.match(typ) is not None
+    return match_reference(typ) is not None
 
 
-def get_reference_base_type(typ: str) -> str:
-    match = REFERENCE_TYPE_RE.match(typ)
+def get_reference_base_type(typ: str | re.Match) -> str:
+    match = typ if isinstance(typ, re.Match) else match_reference(typ)
     return match.group(1)
 
 
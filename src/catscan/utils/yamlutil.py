@@ -1,12 +1,15 @@
 import io
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, TypeVar
 
 from pydantic import TypeAdapter
 from ruamel.yaml import YAML
 
-# Shared YAML
+# Shared YAML, loading does not need the round-trip (comment preserving) mode, and the safe
+# mode is a lot faster (it uses the C loader if available)
 _yaml = YAML()
+_yaml_safe = YAML(typ="safe")
 _T = TypeVar("_T")
 
 
@@ -20,13 +23,19 @@ def load(path: Path | io.IOBase, as_type: type[_T] | None = None) -> _T or Any:
     """
     if isinstance(path, Path):
         with path.open("r") as stream:
-            data = _yaml.load(stream)
+            data = _yaml_safe.load(stream)
     else:
-        data = _yaml.load(path)
+        data = _yaml_safe.load(path)
 
     if as_type is None:
         return data
-    return TypeAdapter(as_type).validate_python(data)
+    return _get_type_adapter(as_type).validate_python(data)
+
+
+@lru_cache
+def _get_type_adapter(as_type: type[_T]) -> TypeAdapter[_T]:
+    # building the validator of a type adapter is relatively expensive, so only do so once
+    return TypeAdapter(as_type)
 
 
 def save(path: Path, data: Any) -> None:
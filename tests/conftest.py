@@ -1,4 +1,4 @@
-import copy
+from collections import defaultdict
 
 import pytest
 
@@ -7,9 +7,21 @@ import pytest
 def reset_checks():
     """Fixture to ensure that lint checks in tests do not interfere with other tests"""
     import catscan.lint.base
+    import catscan.utils.plugin
+    import catscan.utils.program
 
-    registered_codes = copy.deepcopy(catscan.lint.base.__REGISTERED_CODES__)
-    registered_checks = copy.deepcopy(catscan.lint.base.__REGISTERED_CHECKS__)
+    # the registered checks themselves are not modified, only the containers are, so a copy
+    # of the containers suffices (registering a check appends to the list of its type)
+    registered_codes = set(catscan.lint.base.__REGISTERED_CODES__)
+    registered_checks = defaultdict(
+        list,
+        {typ: list(checks) for typ, checks in catscan.lint.base.__REGISTERED_CHECKS__.items()},
+    )
+    # plugins loaded in a test register checks, which are reset, so they must be loaded again
+    loaded_plugins = catscan.utils.plugin.loaded_plugins()
     yield
     catscan.lint.base.__REGISTERED_CODES__ = registered_codes
     catscan.lint.base.__REGISTERED_CHECKS__ = registered_checks
+    catscan.lint.base._DISPATCH_CACHE.clear()
+    catscan.utils.plugin._LOADED_PLUGINS[:] = loaded_plugins
+    catscan.utils.program.clear_traversal_cache()
@@ -4,9 +4,10 @@ from os import PathLike
 from pathlib import Path
 
 from blark.parse import summarize
+from blark.summary import CodeSummary
 
 from catscan import lint
-from catscan.lint.base import do_checks, get_checkable_objects
+from catscan.lint.base import find_errors
 from catscan.parse import parse_all_source_items
 from catscan.settings import CheckSettings, Settings
 
@@ -23,20 +24,29 @@ def make_settings(*, keep: Iterable[str] = ()) -> Settings:
     return Settings(checks=check_settings)
 
 
+def get_code(example: str, tmp_path: PathLike) -> CodeSummary:
+    """Get the code summary of example source code"""
+    tmp_file = Path(tmp_path) / f"Test_{uuid.uuid4()}.TcPOU"
+    with tmp_file.open("w") as f:
+        f.write(example)
+        f.flush()
+
+        # a single file, so parse it in this process instead of sending it to a worker
+        return summarize(
+            list(parse_all_source_items([tmp_file], use_cache=False, parallel=False))
+        )
+
+
 def get_errors(
     example: str,
     tmp_path: PathLike,
     settings: Settings,
 ) -> Iterable[lint.error.Error]:
     """Get errors from example source code"""
-    tmp_file = Path(tmp_path) / f"Test_{uuid.uuid4()}.TcPOU"
-    with tmp_file.open("w") as f:
-        f.write(example)
-        f.flush()
-
-        code = summarize(list(parse_all_source_items([tmp_file], use_cache=False)))
-        for obj, ctx in get_checkable_objects(code, settings):
-            yield from do_checks(obj, ctx=ctx, settings=settings)
+    code = get_code(example, tmp_path)
+    # lint like the linter itself does, which checks objects that are both a statement and an
+    # expression only once
+    yield from find_errors(code, settings)
 
 
 def tcpou(*args) -> str:
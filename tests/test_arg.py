@@ -0,0 +1,28 @@
+import pytest
+from support import function_block, get_errors, make_settings, method, tcpou
+
+
+@pytest.mark.parametrize(
+    "nameless_arg_functions, n_errors",
+    [
+        (set(), 4),
+        ({"F_Test"}, 0),
+        ({"f_test"}, 0),  # TwinCAT names are case-insensitive
+    ],
+)
+def test_nameless_arg_functions(tmp_path, nameless_arg_functions, n_errors):
+    settings = make_settings(keep=["ARG001"])
+    settings.nameless_arg_functions = nameless_arg_functions
+
+    example = tcpou(
+        function_block(
+            method(
+                implementation="""
+                    F_Test(1, 2, 3, 4);
+                """,
+            )
+        )
+    )
+
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == n_errors
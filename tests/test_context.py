@@ -0,0 +1,29 @@
+import pytest
+from support import function_block, get_code, make_settings, tcpou
+
+from catscan.lint.context import Context
+
+
+@pytest.mark.parametrize(
+    "extends, expected",
+    [
+        # each function block is only yielded once, in declaration order
+        ({"A": "B, C", "B": "D", "C": "D", "D": ""}, ["A", "B", "D", "C"]),
+        # cyclic inheritance does not loop forever
+        ({"A": "B", "B": "C", "C": "A"}, ["A", "B", "C"]),
+    ],
+)
+def test_get_all_extends(tmp_path, extends, expected):
+    code = None
+    for name, ext in extends.items():
+        decl = f"EXTENDS {ext}" if ext else ""
+        fb_code = get_code(tcpou(function_block(name=name, decl=decl)), tmp_path)
+        if code is None:
+            code = fb_code
+        else:
+            code.function_blocks.update(fb_code.function_blocks)
+
+    ctx = Context(code=code, settings=make_settings())
+    fb = code.function_blocks["A"]
+    assert [ext.name for ext in ctx.get_all_extends(fb)] == expected
+    assert [ext.name for ext in ctx.get_all_extends(fb, with_self=False)] == expected[1:]
@@ -0,0 +1,33 @@
+import pytest
+from support import function_block, get_errors, make_settings, method, tcpou
+
+
+@pytest.mark.parametrize(
+    "call, suggestion",
+    [
+        ("m_other", "m_Other"),  # capitalization
+        ("m_Othr", "m_Other"),  # typo
+        ("F_Test", None),  # only close to the method it is called from, with another prefix
+    ],
+)
+def test_function_suggestion(tmp_path, call, suggestion):
+    settings = make_settings(keep=["FUNC001"])
+
+    example = tcpou(
+        function_block(
+            method(
+                name="m_Test",
+                implementation=f"""
+                    {call}();
+                """,
+            ),
+            method(name="m_Other"),
+        )
+    )
+
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == 1
+    msg = f"Function {call} not found"
+    if suggestion is not None:
+        msg += f", did you mean '{suggestion}'?"
+    assert errors[0].message == msg
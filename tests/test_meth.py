@@ -0,0 +1,31 @@
+import pytest
+from support import function_block, get_errors, make_settings, method, tcpou
+
+
+@pytest.mark.parametrize(
+    "call, n_errors",
+    [
+        ("SUPER^.m_Test(nValue := nValue);", 1),
+        # names are case-insensitive in TwinCAT
+        ("SUPER^.M_TEST(NVALUE := nvalue);", 1),
+        ("SUPER^.m_Test(nValue := 1);", 0),
+    ],
+)
+def test_method_passthrough_super_call(tmp_path, call, n_errors):
+    settings = make_settings(keep=["METH001"])
+
+    example = tcpou(
+        function_block(
+            method(
+                decl="""
+                    VAR_INPUT
+                        nValue : INT;
+                    END_VAR
+                """,
+                implementation=call,
+            ),
+        )
+    )
+
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == n_errors
@@ -65,3 +65,35 @@ def test_noqa(tmp_path):
     for error in get_errors(example, tmp_path, settings):
         # expect no errors
         raise Exception(error.message)
+
+
+def test_noqa_other_code(tmp_path):
+    settings = make_settings()
+
+    @lint_check("TST001")
+    def test_lint_check(stat: tf.BinaryOperation):
+        if stat.op == "+":
+            yield ErrorInfo(
+                message="I don't like addition!",
+                violating=stat,
+            )
+
+    example = tcpou(
+        function_block(
+            method(
+                decl="""
+                    VAR
+                        s_nTest : INT := 0;
+                    END_VAR
+                """,
+                implementation="""
+                    s_nTest := s_nTest + 1;  // noqa: TST0012 TST002
+                """,
+            )
+        )
+    )
+
+    # only the exact codes in the noqa comment are ignored
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == 1
+    assert errors[0].message == "I don't like addition!"
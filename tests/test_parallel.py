@@ -0,0 +1,56 @@
+import multiprocessing
+import textwrap
+
+from support import function_block, get_code, make_settings, method, tcpou
+
+from catscan.lint.base import find_errors
+from catscan.utils.plugin import load_plugins
+
+PLUGIN = """
+    import blark.transform as tf
+
+    from catscan.lint import ErrorInfo, lint_check
+
+
+    @lint_check("PLG001")
+    def plugin_lint_check(stat: tf.BinaryOperation):
+        if stat.op == "+":
+            yield ErrorInfo(
+                message="I don't like addition!",
+                violating=stat,
+            )
+"""
+
+
+def test_parallel_plugin(tmp_path):
+    plugin_file = tmp_path / "plugin.py"
+    plugin_file.write_text(textwrap.dedent(PLUGIN))
+    load_plugins([plugin_file])
+    settings = make_settings(keep=["PLG001"])
+
+    decl = """
+        VAR
+            s_nTest : INT := 0;
+        END_VAR
+    """
+    example = tcpou(
+        function_block(
+            method(name="m_Test1", decl=decl, implementation="s_nTest := s_nTest + 1;"),
+            method(name="m_Test2", decl=decl, implementation="s_nTest := s_nTest + 2;"),
+        )
+    )
+    code = get_code(example, tmp_path)
+
+    errors = find_errors(code, settings)
+    assert [err.code for err in errors] == ["PLG001", "PLG001"]
+
+    # spawned workers do not inherit the registered checks, so they must load the plugin
+    # themselves
+    parallel_errors = find_errors(
+        code,
+        settings,
+        parallel=True,
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    assert parallel_errors == errors
@@ -0,0 +1,201 @@
+from collections import Counter
+
+import pytest
+from blark.summary import MethodSummary
+from support import function_block, get_code, method, tcpou
+
+from catscan.utils.program import get_statements, has_assignment, has_assignment_before
+
+IMPLEMENTATIONS = {
+    "if": """
+        IF bA THEN
+            nOut := 1;
+        ELSIF bB THEN
+            nOut := 2;
+        ELSE
+            nOut := 3;
+        END_IF
+    """,
+    "if_no_else": """
+        IF bA THEN
+            nOut := 1;
+        ELSIF bB THEN
+            nOut := 2;
+        END_IF
+    """,
+    "if_return": """
+        IF bA THEN
+            RETURN;
+        ELSE
+            nOut := 1;
+        END_IF
+        nRead := nOut;
+    """,
+    "if_all_return": """
+        IF bA THEN
+            RETURN;
+        ELSE
+            RETURN;
+        END_IF
+        nOut := 1;
+    """,
+    "case": """
+        CASE nA OF
+            1:
+                nOut := 1;
+            2, 3:
+                nOut := 2;
+        ELSE
+            nOut := 3;
+        END_CASE
+    """,
+    "case_no_else": """
+        CASE nA OF
+            1:
+                nOut := 1;
+            2:
+                nOut := 2;
+        END_CASE
+    """,
+    "case_all_return": """
+        CASE nA OF
+            1:
+                RETURN;
+        ELSE
+            RETURN;
+        END_CASE
+        nOut := 1;
+    """,
+    "case_no_else_return": """
+        CASE nA OF
+            1:
+                RETURN;
+        END_CASE
+        nOut := 1;
+    """,
+    "loop": """
+        WHILE bA DO
+            nOut := 1;
+        END_WHILE
+    """,
+    "loop_exit": """
+        FOR nA := 0 TO 10 DO
+            IF bA THEN
+                EXIT;
+                nOut := 1;
+            END_IF
+            nOut := 2;
+        END_FOR
+        nRead := nOut;
+    """,
+    "loop_continue": """
+        REPEAT
+            IF bA THEN
+                CONTINUE;
+            END_IF
+            nOut := 1;
+        UNTIL bB
+        END_REPEAT
+    """,
+    "label": """
+        lbl: nOut := 1;
+        nRead := nOut;
+    """,
+    "return": """
+        nOut := 1;
+        RETURN;
+        nRead := nOut;
+    """,
+    "return_before": """
+        RETURN;
+        nOut := 1;
+    """,
+}
+
+
+def get_method(name: str, tmp_path) -> MethodSummary:
+    decl = """
+        VAR
+            bA : BOOL;
+            bB : BOOL;
+            nA : INT;
+            nOut : INT;
+            nRead : INT;
+        END_VAR
+    """
+    example = tcpou(function_block(method(decl=decl, implementation=IMPLEMENTATIONS[name])))
+    return get_code(example, tmp_path).function_blocks["Test"].methods[0]
+
+
+@pytest.mark.parametrize("name", IMPLEMENTATIONS)
+def test_get_statements(tmp_path, name):
+    meth = get_method(name, tmp_path)
+    # the statements of methods come from the program graph, while those of statement lists
+    # come from _get_reachable_statements, which must follow the same rules
+    from_graph = Counter(map(id, get_statements(meth)))
+    from_statements = Counter(map(id, get_statements(meth.implementation)))
+    assert from_graph == from_statements
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("if", True),
+        ("if_no_else", False),
+        ("if_return", False),
+        # returning ends a code path, the assignment after it is unreachable
+        ("if_all_return", False),
+        ("case", True),
+        # a case statement without an else clause is assumed to cover all values
+        ("case_no_else", True),
+        ("case_all_return", False),
+        ("case_no_else_return", False),
+        # the loop condition may be false initially
+        ("loop", False),
+        ("loop_exit", False),
+        ("loop_continue", False),
+        ("label", True),
+        ("return", True),
+        ("return_before", False),
+    ],
+)
+def test_has_assignment(tmp_path, name, expected):
+    meth = get_method(name, tmp_path)
+    assert has_assignment(meth, "nOut") == expected
+    # TwinCAT is case-insensitive
+    assert has_assignment(meth, "NOUT") == expected
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("if_return", True),
+        ("loop_exit", False),
+        ("label", True),
+        # the read itself is unreachable
+        ("return", True),
+    ],
+)
+def test_has_assignment_before(tmp_path, name, expected):
+    meth = get_method(name, tmp_path)
+    stats = meth.implementation.statements
+    read = next(stat for stat in stats if str(stat) == "nRead := nOut;")
+    assert has_assignment_before(read, meth, "nOut") == expected
+
+
+@pytest.mark.parametrize(
+    "implementation, exception",
+    [
+        ("EXIT;", ValueError),
+        ("CONTINUE;", ValueError),
+        ("lbl: nOut := 1;\nJMP lbl;", NotImplementedError),
+    ],
+)
+def test_unsupported_statements(tmp_path, implementation, exception):
+    decl = "VAR nOut : INT; END_VAR"
+    example = tcpou(function_block(method(decl=decl, implementation=implementation)))
+    meth = get_code(example, tmp_path).function_blocks["Test"].methods[0]
+    with pytest.raises(exception):
+        list(get_statements(meth))
+    with pytest.raises(exception):
+        list(get_statements(meth.implementation))
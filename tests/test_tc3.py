@@ -0,0 +1,18 @@
+import pytest
+
+from catscan.utils import tc3
+
+
+@pytest.mark.parametrize("typ", ["ARRAY[0..1, 2..3] OF REAL", "array[0..1, 2..3] of REAL"])
+def test_match_array(typ):
+    assert tc3.get_array_dims_and_base_type(typ) == (1, "REAL")
+
+
+@pytest.mark.parametrize("typ", ["REFERENCE TO REAL", "reference to REAL"])
+def test_match_reference(typ):
+    assert tc3.get_reference_base_type(typ) == "REAL"
+
+
+def test_match_no_keyword():
+    assert not tc3.is_array("T_ArrayOfReal")
+    assert not tc3.is_reference("T_ReferenceToReal")
@@ -0,0 +1,104 @@
+import pytest
+from support import function_block, get_errors, make_settings, method, tcpou
+
+
+@pytest.mark.parametrize(
+    "name, suggestion",
+    [
+        ("s_ntest", "s_nTest"),  # capitalization
+        ("s_nTset", "s_nTest"),  # typo
+        ("s_nCounter", None),  # unrelated
+    ],
+)
+def test_var_suggestion(tmp_path, name, suggestion):
+    settings = make_settings(keep=["VAR001"])
+
+    example = tcpou(
+        function_block(
+            method(
+                decl="""
+                    VAR
+                        s_nTest : INT := 0;
+                    END_VAR
+                """,
+                implementation=f"""
+                    s_nTest := {name};
+                """,
+            )
+        )
+    )
+
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == 1
+    msg = f"Variable {name} cannot be found in the current context"
+    if suggestion is not None:
+        msg += f", did you mean '{suggestion}'?"
+    assert errors[0].message == msg
+
+
+@pytest.mark.parametrize(
+    "implementation, n_errors",
+    [
+        ("bOk := ipA = ipB;", 2),
+        # the arguments of __QUERYINTERFACE are not read, only their types are inspected
+        ("bOk := __QUERYINTERFACE(ipA, ipB);", 0),
+        # only the expressions of the statement itself are excluded, not their subexpressions
+        ("bOk := NOT __QUERYINTERFACE(ipA, ipB);", 2),
+    ],
+)
+def test_uninitialized_var_read(tmp_path, implementation, n_errors):
+    settings = make_settings(keep=["VAR100"])
+
+    example = tcpou(
+        function_block(
+            method(
+                decl="""
+                    VAR
+                        ipA : I_A;
+                        ipB : I_B;
+                        bOk : BOOL;
+                    END_VAR
+                """,
+                implementation=implementation,
+            )
+        )
+    )
+
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == n_errors
+
+
+@pytest.mark.parametrize(
+    "decl, n_errors",
+    [
+        ("arrrValue : ARRAY[0..1] OF REAL;", 0),
+        # only the array prefix itself is removed from the base type prefix, not the r of REAL
+        ("arrValue : ARRAY[0..1] OF REAL;", 1),
+        ("refrValue : REFERENCE TO REAL;", 0),
+        ("refValue : REFERENCE TO REAL;", 1),
+        # keywords are case-insensitive
+        ("arrValue : array[0..1] of REAL;", 1),
+        ("refValue : reference to REAL;", 1),
+    ],
+)
+def test_type_prefix(tmp_path, decl, n_errors):
+    settings = make_settings(keep=["VAR002"])
+    settings.block_prefixes = {"VAR": [""]}
+    settings.type_prefixes = {"REAL": "r"}
+    settings.array_prefix = "arr"
+    settings.reference_prefix = "ref"
+
+    example = tcpou(
+        function_block(
+            method(
+                decl=f"""
+                    VAR
+                        {decl}
+                    END_VAR
+                """,
+            )
+        )
+    )
+
+    errors = list(get_errors(example, tmp_path, settings))
+    assert len(errors) == n_errors